@@ -135,6 +135,10 @@ app_license = "mit"
 
 # Website Routes
 # --------------
+# Hook values must stay lists: frappe's append_hook only flattens list
+# values when aggregating hooks, so a tuple would reach consumers as a
+# single scalar element. The map form still gives downstream code O(1)
+# route lookups.
 website_route_rules = [
 	{"from_route": "/package-request", "to_route": "package-request"},
 	{"from_route": "/check-status", "to_route": "check-status"},
@@ -142,6 +146,10 @@ website_route_rules = [
 	{"from_route": "/admin-dashboard", "to_route": "admin-dashboard"},
 ]
 
+website_route_rules_map = {
+	rule["from_route"]: rule["to_route"] for rule in website_route_rules
+}
+
 # Portal Menu Items
 # -----------------
 portal_menu_items = [
@@ -171,6 +179,17 @@ portal_menu_items = [
 	}
 ]
 
+# Menu items grouped by role once at import so downstream code can fetch
+# a role's items with a dict lookup instead of filtering the full list.
+_PORTAL_MENU_BY_ROLE = {}
+for _item in portal_menu_items:
+	_PORTAL_MENU_BY_ROLE.setdefault(_item["role"], []).append(_item)
+
+
+def get_portal_menu_items(role):
+	"""Return the portal menu items visible to the given role"""
+	return _PORTAL_MENU_BY_ROLE.get(role, [])
+
 # Document Events
 # ---------------
 # Hook on document methods and events
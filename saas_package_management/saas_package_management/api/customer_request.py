@@ -3,26 +3,30 @@
 
 import frappe
 from frappe import _
+from frappe.utils import cint, sbool
+
+from saas_package_management.saas_package_management.doctype.customer_request.customer_request import (
+	is_privileged_user,
+)
 
 
 @frappe.whitelist()
 def create_customer_request(data):
 	"""Create a new customer request from portal"""
-	frappe.log_error(frappe.get_traceback(), "Customer Request Creation Error")
 	try:
 		required_fields = ['customer_name', 'package', 'request_date']
 		for field in required_fields:
 			if not data.get(field):
-				frappe.throw(_(f"Field {field} is required"))
+				frappe.throw(_("Field {0} is required").format(field))
 		
 		if not frappe.db.exists("Customer", data.customer_name):
 			frappe.throw(_("Customer does not exist"))
-		
-		if not frappe.db.exists("Package", data.package):
+
+		is_active = frappe.db.get_value("Package", data.package, "is_active")
+		if is_active is None:
 			frappe.throw(_("Package does not exist"))
-		
-		package_doc = frappe.get_doc("Package", data.package)
-		if not package_doc.is_active:
+
+		if not is_active:
 			frappe.throw(_("Selected package is not active"))
 		
 		request_doc = frappe.new_doc("Customer Request")
@@ -34,9 +38,7 @@ def create_customer_request(data):
 		
 		request_doc.insert(ignore_permissions=True)
 		request_doc.submit()
-		
-		frappe.db.commit()
-		
+
 		return {
 			"status": "success",
 			"message": _("Package request submitted successfully"),
@@ -45,49 +47,61 @@ def create_customer_request(data):
 		
 	except Exception as e:
 		frappe.log_error(frappe.get_traceback(), "Customer Request Creation Error")
-		frappe.throw(_(f"Error creating customer request: {str(e)}"))
+		frappe.throw(_("Error creating customer request: {0}").format(str(e)))
 
 
 @frappe.whitelist()
-def get_customer_requests(customer_name=None):
-	"""Get customer requests for a specific customer"""
+def get_customer_requests(customer_name=None, limit=20, start=0, include_notes=False):
+	"""Get customer requests for a specific customer (paginated)"""
 	try:
 		filters = {}
 		if customer_name:
 			filters["customer_name"] = customer_name
-		
+
+		fields = ["name", "customer_name", "package", "request_date", "status", "creation"]
+		# Over HTTP the flag arrives as a string ('0', 'false', ...), so
+		# coerce it like limit/start before branching
+		if sbool(include_notes):
+			fields += ["notes", "admin_notes"]
+
 		requests = frappe.get_all(
 			"Customer Request",
 			filters=filters,
-			fields=[
-				"name", "customer_name", "package", "request_date", 
-				"status", "notes", "admin_notes", "creation"
-			],
-			order_by="creation desc"
+			fields=fields,
+			order_by="creation desc",
+			limit_start=cint(start),
+			limit_page_length=cint(limit)
 		)
-		
+
 		return requests
 		
 	except Exception as e:
 		frappe.log_error(frappe.get_traceback(), "Get Customer Requests Error")
-		frappe.throw(_(f"Error fetching customer requests: {str(e)}"))
+		frappe.throw(_("Error fetching customer requests: {0}").format(str(e)))
 
 
 @frappe.whitelist()
 def update_request_status(name, status, admin_notes=None):
 	"""Update customer request status (admin only)"""
 	try:
-		if "System Manager" not in frappe.get_roles():
+		if not is_privileged_user():
 			frappe.throw(_("You don't have permission to update request status"))
-		
-		request_doc = frappe.get_doc("Customer Request", name)
-		request_doc.status = status
-		if admin_notes:
-			request_doc.admin_notes = admin_notes
-		
-		request_doc.save()
-		frappe.db.commit()
-		
+
+		if status != "Approved":
+			# Simple status change: a single UPDATE, no document hydration
+			values = {"status": status}
+			if admin_notes:
+				values["admin_notes"] = admin_notes
+			frappe.db.set_value("Customer Request", name, values)
+		else:
+			# Approval must run the full save pipeline to trigger site creation
+			request_doc = frappe.get_doc("Customer Request", name)
+			request_doc.status = status
+			if admin_notes:
+				request_doc.admin_notes = admin_notes
+
+			request_doc.save()
+
 		return {
 			"status": "success",
 			"message": _("Request status updated successfully")
@@ -95,4 +109,4 @@ def update_request_status(name, status, admin_notes=None):
 		
 	except Exception as e:
 		frappe.log_error(frappe.get_traceback(), "Update Request Status Error")
-		frappe.throw(_(f"Error updating request status: {str(e)}"))
+		frappe.throw(_("Error updating request status: {0}").format(str(e)))
@@ -6,17 +6,28 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import today, add_days, get_datetime
 
+# Single-pass normalization of customer names into site names
+_SITE_NAME_TABLE = str.maketrans({" ": "-", ".": "", ",": "", "_": "-"})
+
+DOMAIN_SUFFIX = ".ibssaas.com"
+
 
 class CustomerRequest(Document):
 	def validate(self):
 		"""Validate customer request data"""
+		# The web form handler has already verified the package and
+		# created the customer; skip only this re-query pass
+		if self.flags.skip_portal_revalidation:
+			return
+
 		# Validate that the selected package exists and is active
-		if self.package:
-			if not frappe.db.exists("Package", self.package):
+		# Skip the Package check on repeated saves when package hasn't changed
+		if self.package and (self.is_new() or self.has_value_changed("package")):
+			is_active = frappe.db.get_value("Package", self.package, "is_active", cache=True)
+			if is_active is None:
 				frappe.throw(_("Package '{0}' does not exist").format(self.package))
-			
-			package_doc = frappe.get_doc("Package", self.package)
-			if not package_doc.is_active:
+
+			if not is_active:
 				frappe.throw(_("Package '{0}' is not active").format(self.package))
 		
 		# Validate customer exists
@@ -27,90 +38,189 @@ class CustomerRequest(Document):
 	def before_save(self):
 		"""Set default values and permissions"""
 		# Set admin notes as read-only for customers
-		if frappe.session.user != "Administrator" and "System Manager" not in frappe.get_roles():
+		if not is_privileged_user():
 			self.admin_notes = ""
 	
 	def on_submit(self):
 		"""Actions when request is submitted"""
-		# Send notification to admin
-		self.send_notification_to_admin()
+		# Send notification to admin in the background so submit returns immediately
+		frappe.enqueue(
+			"saas_package_management.saas_package_management.doctype.customer_request.customer_request._notify_admins",
+			queue="short",
+			doc_name=self.name,
+			enqueue_after_commit=True,
+		)
 	
 	def on_update_after_submit(self):
 		"""Actions when request is updated after submission"""
-		# Check if status changed to approved
-		if self.status == "Approved":
-			self.create_customer_site()
+		# Only act when the status actually transitioned to Approved;
+		# later edits of an approved request must not re-run site creation.
+		# Run it in the background so bulk approvals don't serialize on
+		# the request thread.
+		if self.status == "Approved" and self.has_value_changed("status"):
+			frappe.enqueue(
+				"saas_package_management.saas_package_management.doctype.customer_request.customer_request._create_customer_site_job",
+				queue="long",
+				doc_name=self.name,
+				enqueue_after_commit=True,
+			)
 	
 	def create_customer_site(self):
 		"""Create Customer Site when request is approved"""
 		try:
 			# Check if Customer Site already exists for this request
-			existing_site = frappe.get_all(
-				"Customer Site",
-				filters={"customer_request": self.name},
-				fields=["name"]
-			)
-			
-			if existing_site:
+			if frappe.db.exists("Customer Site", {"customer_request": self.name}):
 				frappe.msgprint(_("Customer Site already exists for this request"))
 				return
-			
-			# Check if there are available instances for this package
-			available_instances = frappe.get_all(
-				"Instance",
-				filters={
-					"package": self.package,
-					"is_active": 1,
-					"deployment_status": ["in", ["Running", "Deployed"]]
-				},
-				fields=["name"]
-			)
-			
-			if not available_instances:
-				frappe.throw(_("No available instances found for package '{0}'. Please create an instance first or contact administrator.").format(self.package))
-			
-			# Generate site name from customer name
-			customer_name = self.customer_name
-			site_name = customer_name.lower().replace(" ", "-").replace(".", "").replace(",", "").replace("_", "-")
-			
-			# Ensure site name is unique
-			counter = 1
-			original_site_name = site_name
-			while frappe.db.exists("Customer Site", {"site_name": site_name}):
-				site_name = f"{original_site_name}-{counter}"
-				counter += 1
-			
-			# Create the customer site
-			customer_site = frappe.new_doc("Customer Site")
-			customer_site.customer_request = self.name
-			customer_site.customer_name = self.customer_name
-			customer_site.site_name = site_name
-			customer_site.package = self.package
-			customer_site.status = "Active"
-			
-			# Use custom domain from request if provided, otherwise generate default
-			if self.custom_domain:
-				# If custom domain is provided, append .ibssaas.com if not already present
-				if not self.custom_domain.endswith('.ibssaas.com'):
-					customer_site.custom_domain = f"{self.custom_domain}.ibssaas.com"
-				else:
-					customer_site.custom_domain = self.custom_domain
-			else:
-				customer_site.custom_domain = f"{site_name}.ibssaas.com"
-			
-			customer_site.insert()
-			customer_site.submit()
-			
-			# Update admin notes
+
+			customer_site = _build_and_submit_customer_site(self)
+
+			# Update admin notes with a direct write; a full save would re-run
+			# the whole validate pipeline just for one text field
 			self.admin_notes = f"Customer Site created automatically: {customer_site.name} on {frappe.utils.now()}"
-			self.save()
+			frappe.db.set_value(
+				"Customer Request", self.name, "admin_notes", self.admin_notes,
+				update_modified=False
+			)
 			
 			frappe.msgprint(_("Customer Site created successfully: {0}").format(customer_site.name))
 			
 		except Exception as e:
 			frappe.log_error(f"Error creating Customer Site: {str(e)}", "Customer Site Creation Error")
 			frappe.msgprint(_("Error creating Customer Site: {0}").format(str(e)))
-	
+
+	def send_notification_to_admin(self):
+		"""Send notification to system managers about new request"""
+		subject = f"New Package Request: {self.package} from {self.customer_name}"
+		message = f"""
+		New package request received:
+
+		Customer: {self.customer_name}
+		Package: {self.package}
+		Request Date: {self.request_date}
+		Notes: {self.notes or 'None'}
+
+		Please review and update the status.
+		"""
+
+		recipients = get_system_manager_emails()
+		if recipients:
+			frappe.sendmail(
+				recipients=recipients,
+				subject=subject,
+				message=message
+			)
+
+def is_privileged_user():
+	"""Check for Administrator or System Manager without an extra role query
+
+	The Administrator comparison short-circuits the common desk case;
+	frappe.get_roles(user) is already cached per request.
+	"""
+	return (
+		frappe.session.user == "Administrator"
+		or "System Manager" in frappe.get_roles(frappe.session.user)
+	)
+
+
+def _create_customer_site_job(doc_name):
+	"""Background job: create the Customer Site for an approved request"""
+	doc = frappe.get_doc("Customer Request", doc_name)
+	doc.create_customer_site()
+
+
+def _notify_admins(doc_name):
+	"""Background job: send the admin notification for a submitted request"""
+	doc = frappe.get_doc("Customer Request", doc_name)
+	doc.send_notification_to_admin()
+
+
+def _build_and_submit_customer_site(customer_request, set_dates=False):
+	"""Build, insert and submit a Customer Site for the given request doc"""
+	# Check if there are available instances for this package (LIMIT 1 probe)
+	if not frappe.db.exists(
+		"Instance",
+		{
+			"package": customer_request.package,
+			"is_active": 1,
+			"deployment_status": ["in", ["Running", "Deployed"]]
+		},
+	):
+		frappe.throw(_("No available instances found for package '{0}'. Please create an instance first or contact administrator.").format(customer_request.package))
+
+	# Generate site name from customer name
+	site_name = customer_request.customer_name.lower().translate(_SITE_NAME_TABLE)
+
+	# Ensure site name is unique
+	site_name = get_unique_site_name(site_name)
+
+	# Create the customer site
+	customer_site = frappe.new_doc("Customer Site")
+	customer_site.customer_request = customer_request.name
+	customer_site.customer_name = customer_request.customer_name
+	customer_site.site_name = site_name
+	customer_site.package = customer_request.package
+	customer_site.status = "Active"
+
+	if set_dates:
+		now = get_datetime(today())
+		customer_site.creation_date = now
+		customer_site.approval_date = now
+		customer_site.expiry_date = add_days(now, 365)  # 1 year from today
+
+	# Use custom domain from request if provided, otherwise generate default.
+	# Only build a new string when the suffix actually needs appending.
+	domain = customer_request.custom_domain
+	if domain:
+		customer_site.custom_domain = domain if domain.endswith(DOMAIN_SUFFIX) else domain + DOMAIN_SUFFIX
+	else:
+		customer_site.custom_domain = site_name + DOMAIN_SUFFIX
+
+	customer_site.insert()
+	customer_site.submit()
+
+	return customer_site
+
+
+def get_unique_site_name(site_name):
+	"""Return site_name, suffixed with the next free counter if it is taken"""
+	existing = frappe.db.sql_list(
+		"SELECT site_name FROM `tabCustomer Site` WHERE site_name = %s OR site_name LIKE %s",
+		(site_name, site_name + "-%"),
+	)
+	if not existing:
+		return site_name
+
+	max_suffix = 0
+	prefix = site_name + "-"
+	for name in existing:
+		if name == site_name:
+			continue
+		suffix = name[len(prefix):]
+		if suffix.isdigit():
+			max_suffix = max(max_suffix, int(suffix))
+
+	return f"{site_name}-{max_suffix + 1}"
+
+
+def get_system_manager_emails():
+	"""Get emails of enabled users with the System Manager role (cached)"""
+	emails = frappe.cache().get_value("system_manager_emails")
+	if emails is None:
+		emails = frappe.db.sql_list(
+			"""
+			SELECT DISTINCT u.email
+			FROM `tabUser` u
+			JOIN `tabHas Role` r ON r.parent = u.name
+			WHERE r.role = 'System Manager'
+				AND u.enabled = 1
+				AND u.email IS NOT NULL
+			"""
+		)
+		frappe.cache().set_value("system_manager_emails", emails, expires_in_sec=300)
+	return emails
+
+
 @frappe.whitelist()
 def create_customer_site(customer_request_name):
 	"""API method to create Customer Site from Customer Request"""
@@ -125,69 +235,14 @@ def create_customer_site(customer_request_name):
 			}
 		
 		# Check if Customer Site already exists
-		existing_sites = frappe.get_all(
-			"Customer Site",
-			filters={"customer_request": customer_request_name},
-			fields=["name"]
-		)
-		
-		if existing_sites:
+		if frappe.db.exists("Customer Site", {"customer_request": customer_request_name}):
 			return {
 				"success": False,
 				"message": "Customer Site already exists for this request"
 			}
 		
-		# Check if there are available instances for this package
-		available_instances = frappe.get_all(
-			"Instance",
-			filters={
-				"package": customer_request.package,
-				"is_active": 1,
-				"deployment_status": ["in", ["Running", "Deployed"]]
-			},
-			fields=["name"]
-		)
-		
-		if not available_instances:
-			return {
-				"success": False,
-				"message": f"No available instances found for package '{customer_request.package}'. Please create an instance first or contact administrator."
-			}
-		
-		# Generate site name from customer name
-		customer_name = customer_request.customer_name
-		site_name = customer_name.lower().replace(" ", "-").replace(".", "").replace(",", "").replace("_", "-")
-		
-		# Ensure site name is unique
-		counter = 1
-		original_site_name = site_name
-		while frappe.db.exists("Customer Site", {"site_name": site_name}):
-			site_name = f"{original_site_name}-{counter}"
-			counter += 1
-		
-		# Create the customer site
-		customer_site = frappe.new_doc("Customer Site")
-		customer_site.customer_request = customer_request_name
-		customer_site.customer_name = customer_request.customer_name
-		customer_site.site_name = site_name
-		customer_site.package = customer_request.package
-		customer_site.status = "Active"
-		customer_site.creation_date = get_datetime(today())
-		customer_site.approval_date = get_datetime(today())	
-		customer_site.expiry_date = add_days(get_datetime(today()), 365)  # 1 year from today
-		
-		# Use custom domain from request if provided
-		if customer_request.custom_domain:
-			if not customer_request.custom_domain.endswith('.ibssaas.com'):
-				customer_site.custom_domain = f"{customer_request.custom_domain}.ibssaas.com"
-			else:
-				customer_site.custom_domain = customer_request.custom_domain
-		else:
-			customer_site.custom_domain = f"{site_name}.ibssaas.com"
-		
-		customer_site.insert()
-		customer_site.submit()
-		
+		customer_site = _build_and_submit_customer_site(customer_request, set_dates=True)
+
 		# Update admin notes using frappe.db.set_value to avoid timestamp conflicts
 		frappe.db.set_value(
 			"Customer Request", 
@@ -215,31 +270,3 @@ def create_customer_site(customer_request_name):
 			"success": False,
 			"message": str(e)
 		}
-	
-	def send_notification_to_admin(self):
-		"""Send notification to system managers about new request"""
-		subject = f"New Package Request: {self.package} from {self.customer_name}"
-		message = f"""
-		New package request received:
-		
-		Customer: {self.customer_name}
-		Package: {self.package}
-		Request Date: {self.request_date}
-		Notes: {self.notes or 'None'}
-		
-		Please review and update the status.
-		"""
-		
-		# Get all system managers
-		system_managers = frappe.get_all("User", 
-			filters={"role_profile_name": "System Manager"}, 
-			fields=["email"]
-		)
-		
-		for manager in system_managers:
-			if manager.email:
-				frappe.sendmail(
-					recipients=[manager.email],
-					subject=subject,
-					message=message
-				)
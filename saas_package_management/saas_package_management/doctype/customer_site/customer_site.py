@@ -1,11 +1,25 @@
 import frappe
 from frappe import _
-from frappe.utils import today, add_days, get_datetime
+from frappe.utils import today, add_days, get_datetime, getdate
 from frappe.model.document import Document
-from datetime import timedelta
-import paramiko
-import json
+from datetime import date, timedelta
+import functools
+import shlex
+import threading
 import time
+import json
+import re
+import string
+
+# Deleting every allowed character must leave nothing behind; a single
+# C-level translate pass beats a regex for this charset allowlist check
+_SITE_NAME_BAD_CHARS = str.maketrans('', '', string.ascii_letters + string.digits + '-_')
+
+# Single-pass customer-name to site-name slug transformation
+_SLUG_TABLE = str.maketrans({" ": "-", ".": None, ",": None})
+
+# Compiled once at import; validate() runs this on every save
+_DOMAIN_RE = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$')
 
 
 class CustomerSite(Document):
@@ -13,83 +27,103 @@ class CustomerSite(Document):
     
     def validate(self):
         """Validate Customer Site data"""
+        self._prefetch_links()
         self.validate_customer_request()
         self.validate_site_name()
         self.validate_custom_domain()
+        self.validate_uniqueness()
         self.validate_dates()
         self.set_default_values()
     
+    def _prefetch_links(self):
+        """Fetch scalars of linked docs once so later steps reuse them"""
+        self._customer_request_info = None
+        if self.customer_request:
+            self._customer_request_info = frappe.db.get_value(
+                "Customer Request",
+                self.customer_request,
+                ["status", "customer_name", "package"],
+                as_dict=True
+            )
+
     def validate_customer_request(self):
         """Validate that customer request exists and is approved"""
         if self.customer_request:
-            try:
-                customer_request = frappe.get_doc("Customer Request", self.customer_request)
-                if customer_request.status != "Approved":
-                    frappe.throw(_("Customer Request must be approved before creating a Customer Site"))
-                
-                # Auto-fill customer name and package from customer request
-                if not self.customer_name:
-                    self.customer_name = customer_request.customer_name
-                if not self.package:
-                    self.package = customer_request.package
-                    
-            except frappe.DoesNotExistError:
+            customer_request = self._customer_request_info
+            if not customer_request:
                 frappe.throw(_("Customer Request {0} does not exist").format(self.customer_request))
+
+            if customer_request.status != "Approved":
+                frappe.throw(_("Customer Request must be approved before creating a Customer Site"))
+
+            # Auto-fill customer name and package from customer request
+            if not self.customer_name:
+                self.customer_name = customer_request.customer_name
+            if not self.package:
+                self.package = customer_request.package
     
     def validate_site_name(self):
         """Validate site name uniqueness and format"""
         if self.site_name:
-            # Check for duplicate site names
-            existing_sites = frappe.get_all(
-                "Customer Site",
-                filters={"site_name": self.site_name},
-                fields=["name"]
-            )
-            
-            # Exclude current document from check if updating
-            if self.name:
-                existing_sites = [site for site in existing_sites if site.name != self.name]
-            
-            if existing_sites:
-                frappe.throw(_("Site name '{0}' already exists").format(self.site_name))
-            
             # Validate site name format (alphanumeric, hyphens, underscores only)
-            import re
-            if not re.match(r'^[a-zA-Z0-9_-]+$', self.site_name):
+            if self.site_name.translate(_SITE_NAME_BAD_CHARS):
                 frappe.throw(_("Site name can only contain letters, numbers, hyphens, and underscores"))
     
     def validate_custom_domain(self):
         """Validate custom domain format"""
         if self.custom_domain:
+            # Cheap structural prechecks reject obviously bad domains in O(1)
+            # before the regex engine is engaged
+            domain = self.custom_domain
+            if (
+                len(domain) > 253
+                or domain.startswith(('-', '.'))
+                or domain.endswith(('-', '.'))
+                or '..' in domain
+            ):
+                frappe.throw(_("Invalid custom domain format"))
+
             # Basic domain validation
-            import re
-            domain_pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$'
-            if not re.match(domain_pattern, self.custom_domain):
+            if not _DOMAIN_RE.fullmatch(domain):
                 frappe.throw(_("Invalid custom domain format"))
-            
-            # Check for duplicate domains
-            existing_sites = frappe.get_all(
-                "Customer Site",
-                filters={"custom_domain": self.custom_domain},
-                fields=["name"]
-            )
-            
-            # Exclude current document from check if updating
-            if self.name:
-                existing_sites = [site for site in existing_sites if site.name != self.name]
-            
-            if existing_sites:
-                frappe.throw(_("Custom domain '{0}' is already in use").format(self.custom_domain))
     
+    def validate_uniqueness(self):
+        """Check site name and custom domain collisions in a single query"""
+        or_filters = {}
+        if self.site_name:
+            or_filters["site_name"] = self.site_name
+        if self.custom_domain:
+            or_filters["custom_domain"] = self.custom_domain
+
+        if not or_filters:
+            return
+
+        clashes = frappe.get_all(
+            "Customer Site",
+            filters={"name": ["!=", self.name or ""]},
+            or_filters=or_filters,
+            fields=["site_name", "custom_domain"]
+        )
+
+        for clash in clashes:
+            if self.site_name and clash.site_name == self.site_name:
+                frappe.throw(_("Site name '{0}' already exists").format(self.site_name))
+            if self.custom_domain and clash.custom_domain == self.custom_domain:
+                frappe.throw(_("Custom domain '{0}' is already in use").format(self.custom_domain))
+
     def validate_dates(self):
         """Validate date fields"""
-        if self.expiry_date and self.creation_date:
-            if self.expiry_date <= self.creation_date:
-                frappe.throw(_("Expiry date must be after creation date"))
-        
-        if self.approval_date and self.creation_date:
-            if self.approval_date < self.creation_date:
-                frappe.throw(_("Approval date cannot be before creation date"))
+        # Parse each date once; comparing mixed str/date values silently
+        # compares lexicographically and reparsing per comparison is waste
+        creation = getdate(self.creation_date) if self.creation_date else None
+        expiry = getdate(self.expiry_date) if self.expiry_date else None
+        approval = getdate(self.approval_date) if self.approval_date else None
+
+        if expiry and creation and expiry <= creation:
+            frappe.throw(_("Expiry date must be after creation date"))
+
+        if approval and creation and approval < creation:
+            frappe.throw(_("Approval date cannot be before creation date"))
     
     def set_default_values(self):
         """Set default values for various fields"""
@@ -99,86 +133,102 @@ class CustomerSite(Document):
         if not self.status:
             self.status = "Active"
         
-        # Set expiry date based on package if not specified
+        # Set expiry date based on package if not specified.
+        # Default to 1 year from creation date; no Package fields are
+        # needed for this, so don't fetch the document. Plain timedelta
+        # arithmetic avoids the string round-trip inside add_days.
         if not self.expiry_date and self.package:
-            try:
-                package_doc = frappe.get_doc("Package", self.package)
-                # Default to 1 year from creation date
-                self.expiry_date = add_days(self.creation_date, 365)
-            except frappe.DoesNotExistError:
-                pass
-        
-        # Assign available instance if not already assigned
-        if not hasattr(self, 'instance') or not self.instance:
+            self.expiry_date = getdate(self.creation_date) + timedelta(days=365)
+        
+        # Assign available instance if not already assigned.
+        # self.get() handles the missing-attribute case without the
+        # hasattr() double lookup.
+        if not self.get('instance'):
             self.assign_available_instance()
     
     def before_save(self):
         """Actions before saving the document"""
         self.update_admin_notes()
     
+    def get_save_timestamp(self):
+        """Format the save timestamp once per save cycle and reuse it"""
+        if not getattr(self, "_save_ts", None):
+            self._save_ts = get_datetime().strftime('%B %d, %Y at %I:%M %p')
+        return self._save_ts
+
     def update_admin_notes(self):
         """Update admin notes with system information"""
+        # Only append a note when a tracked field actually changed;
+        # no-op saves must not grow admin_notes forever
+        changed = self.is_new() or any(
+            self.has_value_changed(field)
+            for field in ("status", "site_name", "custom_domain", "package", "expiry_date")
+        )
+        if not changed:
+            return
+
         admin_notes = []
-        
+
         if self.is_new():
-            admin_notes.append(f"Customer Site created on {get_datetime().strftime('%B %d, %Y at %I:%M %p')}")
+            admin_notes.append(f"Customer Site created on {self.get_save_timestamp()}")
         else:
-            admin_notes.append(f"Customer Site updated on {get_datetime().strftime('%B %d, %Y at %I:%M %p')}")
+            admin_notes.append(f"Customer Site updated on {self.get_save_timestamp()}")
         
         if self.approval_date and not self.admin_notes:
             admin_notes.append(f"Site approved on {self.approval_date.strftime('%B %d, %Y')}")
         
         if admin_notes:
-            existing_notes = self.admin_notes or ""
-            self.admin_notes = existing_notes + "\n\n" + "\n".join(admin_notes) if existing_notes else "\n".join(admin_notes)
+            parts = [self.admin_notes, ""] if self.admin_notes else []
+            parts.extend(admin_notes)
+            # Keep only the most recent lines so the field stays bounded
+            self.admin_notes = "\n".join("\n".join(parts).splitlines()[-50:])
     
+    def on_update(self):
+        """Actions after the document is saved"""
+        # Drop the cached status so pollers see fresh data
+        frappe.cache().delete_value(f"site_status::{self.name}")
+
     def on_submit(self):
         """Actions when document is submitted"""
-        self.send_notification_email()
-        self.update_customer_request_status()
+        frappe.cache().delete_value(f"site_status::{self.name}")
+        # Run the email and the request-note update in one background
+        # job so submit doesn't block on SMTP I/O; the address rides in
+        # the payload so the worker skips its own Customer lookup
+        customer_email = (
+            frappe.db.get_value("Customer", self.customer_name, "email_id")
+            if self.customer_name else None
+        )
+        frappe.enqueue(
+            "saas_package_management.saas_package_management.doctype.customer_site.customer_site._run_post_submit_tasks",
+            queue="short",
+            site=self.name,
+            customer_email=customer_email,
+            enqueue_after_commit=True,
+        )
     
     def send_notification_email(self):
         """Send notification email to customer"""
         try:
             if self.customer_name:
-                customer_email = frappe.db.get_value("Customer", self.customer_name, "email_id")
+                customer_email = getattr(self, "_customer_email", None) or frappe.db.get_value(
+                    "Customer", self.customer_name, "email_id"
+                )
                 if customer_email:
                     subject = f"Your Site is Ready - {self.site_name}"
-                    message = f"""
-                    <h3>Congratulations! Your site is now active.</h3>
-                    <p>Your package request has been approved and your site is ready for use.</p>
-                    
-                    <table border="1" style="border-collapse: collapse; width: 100%;">
-                        <tr>
-                            <td><strong>Site Name:</strong></td>
-                            <td>{self.site_name}</td>
-                        </tr>
-                        <tr>
-                            <td><strong>Custom Domain:</strong></td>
-                            <td>{self.custom_domain or 'Not configured'}</td>
-                        </tr>
-                        <tr>
-                            <td><strong>Package:</strong></td>
-                            <td>{self.package}</td>
-                        </tr>
-                        <tr>
-                            <td><strong>Status:</strong></td>
-                            <td>{self.status}</td>
-                        </tr>
-                        <tr>
-                            <td><strong>Creation Date:</strong></td>
-                            <td>{self.creation_date}</td>
-                        </tr>
-                        <tr>
-                            <td><strong>Expiry Date:</strong></td>
-                            <td>{self.expiry_date or 'Not set'}</td>
-                        </tr>
-                    </table>
-                    
-                    <p>You can now access your site and start using your selected package features.</p>
-                    <p>If you have any questions, please contact our support team.</p>
-                    """
-                    
+                    # Rendered via Jinja so the compiled template is cached
+                    # per process and field values are auto-escaped
+                    message = frappe.render_template(
+                        "saas_package_management/templates/emails/site_ready.html",
+                        {
+                            "site_name": self.site_name,
+                            "custom_domain": self.custom_domain or 'Not configured',
+                            "package": self.package,
+                            "status": self.status,
+                            "creation_date": self.creation_date,
+                            "expiry_date": self.expiry_date or 'Not set',
+                        }
+                    )
+
                     frappe.sendmail(
                         recipients=[customer_email],
                         subject=subject,
@@ -192,9 +242,14 @@ class CustomerSite(Document):
         """Update the related customer request status"""
         try:
             if self.customer_request:
-                customer_request = frappe.get_doc("Customer Request", self.customer_request)
-                customer_request.admin_notes = f"Customer Site created: {self.name} on {get_datetime().strftime('%B %d, %Y at %I:%M %p')}"
-                customer_request.save(ignore_permissions=True)
+                # A single UPDATE; loading and saving the full document
+                # would re-run its whole hook pipeline for one text field
+                frappe.db.set_value(
+                    "Customer Request",
+                    self.customer_request,
+                    "admin_notes",
+                    f"Customer Site created: {self.name} on {self.get_save_timestamp()}"
+                )
         except Exception as e:
             frappe.log_error(f"Error updating customer request: {str(e)}", "Customer Request Update Error")
     
@@ -204,27 +259,33 @@ class CustomerSite(Document):
             if not self.package:
                 return
             
-            # Find an available instance for this package
-            available_instances = frappe.get_all(
-                "Instance",
-                filters={
-                    "package": self.package,
-                    "is_active": 1,
-                    "deployment_status": ["in", ["Running", "Deployed"]]
-                },
-                fields=["name", "instance_name", "ram_gb", "cpu_cores", "storage_gb"],
-                order_by="creation asc"
+            # Claim one available instance atomically: the row lock with
+            # SKIP LOCKED stops two concurrent sites grabbing the same one
+            rows = frappe.db.sql(
+                """
+                SELECT name, instance_name, ram_gb, cpu_cores, storage_gb
+                FROM `tabInstance`
+                WHERE package = %s
+                    AND is_active = 1
+                    AND deployment_status IN ('Running', 'Deployed')
+                ORDER BY creation
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+                """,
+                (self.package,),
+                as_dict=True
             )
-            
-            if available_instances:
-                # Assign the first available instance
-                instance = available_instances[0]
+
+            if rows:
+                instance = rows[0]
                 self.instance = instance.name
-                
-                # Update instance status to deployed
-                frappe.db.set_value("Instance", instance.name, "deployment_status", "Deployed")
-                frappe.db.set_value("Instance", instance.name, "server_url", self.custom_domain or f"{self.site_name}.ibssaas.com")
-                
+
+                # Update instance status to deployed in one UPDATE
+                frappe.db.set_value("Instance", instance.name, {
+                    "deployment_status": "Deployed",
+                    "server_url": self.custom_domain or f"{self.site_name}.ibssaas.com"
+                })
+
                 # Add instance info to site details
                 instance_info = f"Instance: {instance.instance_name}\nRAM: {instance.ram_gb}GB\nCPU: {instance.cpu_cores} cores\nStorage: {instance.storage_gb}GB"
                 if self.site_details:
@@ -244,18 +305,18 @@ class CustomerSite(Document):
         try:
             if not self.instance:
                 return {"status": "no_instance", "message": "No instance assigned"}
-            
-            instance_doc = frappe.get_doc("Instance", self.instance)
-            
+
+            deployment_status = frappe.get_cached_value("Instance", self.instance, "deployment_status")
+
             # Basic health check - in a real implementation, this would ping the actual site
-            if instance_doc.deployment_status == "Running":
+            if deployment_status == "Running":
                 return {"status": "healthy", "message": "Site is running normally"}
-            elif instance_doc.deployment_status == "Maintenance":
+            elif deployment_status == "Maintenance":
                 return {"status": "maintenance", "message": "Site is under maintenance"}
-            elif instance_doc.deployment_status == "Stopped":
+            elif deployment_status == "Stopped":
                 return {"status": "stopped", "message": "Site is stopped"}
             else:
-                return {"status": "unknown", "message": f"Instance status: {instance_doc.deployment_status}"}
+                return {"status": "unknown", "message": f"Instance status: {deployment_status}"}
                 
         except Exception as e:
             frappe.log_error(f"Error checking site health: {str(e)}", "Site Health Check Error")
@@ -266,9 +327,11 @@ class CustomerSite(Document):
         try:
             if not self.expiry_date:
                 return {"status": "no_expiry", "message": "No expiry date set"}
-            
-            from frappe.utils import getdate, today
-            days_until_expiry = (getdate(self.expiry_date) - getdate(today())).days
+
+            # getdate() is a no-op parse when the field is already a date
+            # object; only string values from the DB pay the parse cost.
+            expiry = self.expiry_date if isinstance(self.expiry_date, date) else getdate(self.expiry_date)
+            days_until_expiry = (expiry - date.today()).days
             
             if days_until_expiry < 0:
                 return {"status": "expired", "message": f"Site expired {abs(days_until_expiry)} days ago"}
@@ -282,6 +345,14 @@ class CustomerSite(Document):
             return {"status": "error", "message": "Error checking expiry status"}
 
 
+def _run_post_submit_tasks(site, customer_email=None):
+    """Background job: notify the customer and update the linked request"""
+    doc = frappe.get_doc("Customer Site", site)
+    doc._customer_email = customer_email
+    doc.send_notification_email()
+    doc.update_customer_request_status()
+
+
 @frappe.whitelist()
 def create_site_from_request(customer_request_name):
     """Create a Customer Site from an approved Customer Request"""
@@ -293,26 +364,27 @@ def create_site_from_request(customer_request_name):
             frappe.throw(_("Customer Request must be approved before creating a Customer Site"))
         
         # Check if site already exists for this request
-        existing_sites = frappe.get_all(
-            "Customer Site",
-            filters={"customer_request": customer_request_name},
-            fields=["name"]
-        )
-        
-        if existing_sites:
+        if frappe.db.exists("Customer Site", {"customer_request": customer_request_name}):
             frappe.throw(_("Customer Site already exists for this request"))
-        
-        
+
+
         # Generate site name from customer name
         customer_name = customer_request.customer_name
-        site_name = customer_name.lower().replace(" ", "-").replace(".", "").replace(",", "")
+        site_name = customer_name.lower().translate(_SLUG_TABLE)
         
-        # Ensure site name is unique
-        counter = 1
+        # Ensure site name is unique: fetch all taken names for the prefix
+        # once instead of probing the DB per collision
         original_site_name = site_name
-        while frappe.db.exists("Customer Site", {"site_name": site_name}):
+        taken = set(frappe.get_all(
+            "Customer Site",
+            filters={"site_name": ["like", f"{original_site_name}%"]},
+            pluck="site_name"
+        ))
+        if original_site_name in taken:
+            counter = 1
+            while f"{original_site_name}-{counter}" in taken:
+                counter += 1
             site_name = f"{original_site_name}-{counter}"
-            counter += 1
         
         # Create the customer site
         customer_site = frappe.new_doc("Customer Site")
@@ -327,13 +399,11 @@ def create_site_from_request(customer_request_name):
         # Set default custom domain
         customer_site.custom_domain = f"{site_name}.ibssaas.com"
         
-        # Insert the document first
-        customer_site.insert()
-        
-        # Assign available instance after insertion
+        # Assign the instance before inserting so the site is written in a
+        # single INSERT instead of an insert-then-save round trip
         customer_site.assign_available_instance()
-        customer_site.save()
-        
+        customer_site.insert()
+
         return {
             "success": True,
             "message": f"Customer Site created successfully: {customer_site.name}",
@@ -405,15 +475,17 @@ def test_ssh_connection(instance_name):
             # Test basic commands
             stdin, stdout, stderr = ssh_client.exec_command('whoami')
             user = stdout.read().decode().strip()
-            
+
             stdin, stdout, stderr = ssh_client.exec_command('pwd')
             current_dir = stdout.read().decode().strip()
-            
-            stdin, stdout, stderr = ssh_client.exec_command('ls -la')
-            ls_output = stdout.read().decode().strip()
-            
+
+            # Truncate the listing on the remote side so a huge home
+            # directory can't flood the channel; we only show 500 bytes
+            stdin, stdout, stderr = ssh_client.exec_command('ls -la | head -c 600')
+            ls_output = stdout.read(600).decode(errors="replace").strip()
+
             ssh_client.close()
-            
+
             return {
                 "success": True,
                 "message": "SSH connection successful",
@@ -441,25 +513,32 @@ def test_ssh_connection(instance_name):
 def get_site_status(site_name):
     """Get the status of a customer site"""
     try:
-        site = frappe.get_doc("Customer Site", site_name)
-        return {
-            "success": True,
-            "data": {
-                "name": site.name,
-                "site_name": site.site_name,
-                "custom_domain": site.custom_domain,
-                "status": site.status,
-                "customer_name": site.customer_name,
-                "package": site.package,
-                "creation_date": site.creation_date,
-                "expiry_date": site.expiry_date
+        cache_key = f"site_status::{site_name}"
+        cached = frappe.cache().get_value(cache_key)
+        if cached:
+            return cached
+
+        data = frappe.db.get_value(
+            "Customer Site",
+            site_name,
+            [
+                "name", "site_name", "custom_domain", "status",
+                "customer_name", "package", "creation_date", "expiry_date"
+            ],
+            as_dict=True
+        )
+        if not data:
+            return {
+                "success": False,
+                "message": "Site not found"
             }
+
+        result = {
+            "success": True,
+            "data": data
         }
-    except frappe.DoesNotExistError:
-        return {
-            "success": False,
-            "message": "Site not found"
-        }
+        frappe.cache().set_value(cache_key, result, expires_in_sec=30)
+        return result
     except Exception as e:
         frappe.log_error(f"Error getting site status: {str(e)}", "Site Status Error")
         return {
@@ -485,11 +564,12 @@ def create_site(customer_site):
         if not customer_site_doc.package:
             return {"success": False, "message": "Package not specified"}
         
-        # Get instance information
-        instance_doc = frappe.get_doc("Instance", customer_site_doc.instance)
-        
+        # Get instance information (read-only here; the background job
+        # fetches its own fresh copy before doing SSH work)
+        instance_doc = frappe.get_cached_doc("Instance", customer_site_doc.instance)
+
         # Get package information for quota configuration
-        package_doc = frappe.get_doc("Package", customer_site_doc.package)
+        package_doc = frappe.get_cached_doc("Package", customer_site_doc.package)
         
         # Start site creation as background job
         frappe.enqueue(
@@ -515,12 +595,22 @@ def create_site_background(customer_site, instance, package):
         # Get documents
         customer_site_doc = frappe.get_doc("Customer Site", customer_site)
         instance_doc = frappe.get_doc("Instance", instance)
-        package_doc = frappe.get_doc("Package", package)
-        
-        # Update status to creating
+
+        # Only a handful of Package fields are needed; fetch them in one
+        # query instead of hydrating the full document
+        package_info = frappe.db.get_value(
+            "Package", package,
+            ["package_name", "price", "features", "users_limit", "invoices_limit", "expenses_limit"],
+            as_dict=True
+        )
+        if not package_info:
+            raise Exception(f"Package {package} not found")
+
+        # Update status to creating; progress is streamed over realtime
+        # events, so no early commit is needed here - the job commits
+        # once at the end
         frappe.db.set_value("Customer Site", customer_site_doc.name, "status", "Creating Site")
-        frappe.db.commit()
-        
+
         # Connect to instance via SSH
         frappe.publish_realtime('site_creation_progress', {
             'progress': 5,
@@ -537,86 +627,74 @@ def create_site_background(customer_site, instance, package):
         
         # Get decrypted database password
         try:
-            db_password = instance_doc.get_password("database_password")
+            db_password = _get_instance_password(instance_doc, "database_password")
             if not db_password:
                 raise Exception("Database password is not set or could not be decrypted")
         except Exception as e:
             raise Exception(f"Failed to get database password: {str(e)}")
         
-        create_site_command = f"bench new-site {site_name} --db-root-password {db_password} --admin-password adminpass"
-        
         frappe.publish_realtime('site_creation_progress', {
             'progress': 10,
-            'message': 'Creating site...'
-        })
-        
-        stdin, stdout, stderr = ssh_client.exec_command(f"cd {instance_doc.bench} && {create_site_command}")
-        
-        # Wait for command to complete
-        exit_status = stdout.channel.recv_exit_status()
-        if exit_status != 0:
-            error_output = stderr.read().decode()
-            raise Exception(f"Site creation failed: {error_output}")
-        
-        frappe.publish_realtime('site_creation_progress', {
-            'progress': 30,
-            'message': 'Site created successfully'
-        })
-        
-        # Step 2: Install ERPNext
-        frappe.publish_realtime('site_creation_progress', {
-            'progress': 40,
-            'message': 'Installing ERPNext...'
-        })
-        
-        install_erpnext_command = f"bench --site {site_name} install-app erpnext"
-        stdin, stdout, stderr = ssh_client.exec_command(f"cd {instance_doc.bench} && {install_erpnext_command}")
-        exit_status = stdout.channel.recv_exit_status()
-        
-        if exit_status != 0:
-            error_output = stderr.read().decode()
-            raise Exception(f"ERPNext installation failed: {error_output}")
-        
-        frappe.publish_realtime('site_creation_progress', {
-            'progress': 60,
-            'message': 'ERPNext installed successfully'
+            'message': 'Creating site and installing apps...'
         })
-        
-        # Step 3: Install erpnext_quota
-        frappe.publish_realtime('site_creation_progress', {
-            'progress': 70,
-            'message': 'Installing erpnext_quota...'
-        })
-        
-        install_quota_command = f"bench --site {site_name} install-app erpnext_quota"
-        stdin, stdout, stderr = ssh_client.exec_command(f"cd {instance_doc.bench} && {install_quota_command}")
-        exit_status = stdout.channel.recv_exit_status()
-        
+
+        # Steps 1-3 run in a single SSH exec so channel setup is paid
+        # once; echo markers in stdout tell us how far the chain got so
+        # errors can still be attributed to the right step. Interpolated
+        # fields are shell-quoted - site names and passwords must never
+        # reach the remote shell as bare words.
+        q_site = shlex.quote(site_name)
+        steps = [
+            ("Site creation", f"bench new-site {q_site} --db-root-password {shlex.quote(db_password)} --admin-password adminpass"),
+            ("ERPNext installation", f"bench --site {q_site} install-app erpnext"),
+            ("erpnext_quota installation", f"bench --site {q_site} install-app erpnext_quota"),
+        ]
+        combined_command = " && ".join(
+            f"{command} && echo __STEP_{index}_DONE__"
+            for index, (_label, command) in enumerate(steps)
+        )
+
+        stdin, stdout, stderr = ssh_client.exec_command(f"cd {shlex.quote(instance_doc.bench)} && {combined_command}")
+
+        # Wait for the chain to complete, draining both streams as it runs
+        exit_status, out_bytes, err_bytes = _drain_channel(stdout.channel, timeout=3600)
+        output = out_bytes.decode()
+        completed = sum(1 for index in range(len(steps)) if f"__STEP_{index}_DONE__" in output)
+
         if exit_status != 0:
-            error_output = stderr.read().decode()
-            raise Exception(f"erpnext_quota installation failed: {error_output}")
-        
-        frappe.publish_realtime('site_creation_progress', {
-            'progress': 80,
-            'message': 'erpnext_quota installed successfully'
-        })
-        
-        # Step 4: Configure quota
+            error_output = err_bytes.decode()
+            failed_step = steps[min(completed, len(steps) - 1)][0]
+            raise Exception(f"{failed_step} failed: {error_output}")
+
+        # Step 4: Configure quota. One event covers "apps installed" and
+        # "quota starting" - back-to-back events a few ms apart only add
+        # redis round trips without giving the UI anything extra to show
         frappe.publish_realtime('site_creation_progress', {
             'progress': 85,
-            'message': 'Configuring quota limits...'
+            'message': 'Apps installed, configuring quota limits...'
         })
+
+        configure_quota(ssh_client, instance_doc, site_name, package_info)
         
-        configure_quota(ssh_client, instance_doc, site_name, package_doc)
-        
-        # Step 5: Setup SSL with Let's Encrypt
+        # Step 5: SSL runs as its own job - Let's Encrypt plus an nginx
+        # reload can take tens of seconds, failures are non-fatal anyway,
+        # and a worker pool can run many SSL jobs concurrently
         frappe.publish_realtime('site_creation_progress', {
             'progress': 90,
-            'message': 'Setting up SSL certificate...'
+            'message': 'SSL certificate setup queued...'
         })
-        
-        setup_ssl_certificate(ssh_client, instance_doc, site_name, customer_site_doc.custom_domain)
-        
+
+        frappe.enqueue(
+            'saas_package_management.saas_package_management.doctype.customer_site.customer_site.setup_ssl_certificate_job',
+            queue='long',
+            job_name=f'ssl-{site_name}',
+            instance=instance_doc.name,
+            site_name=site_name,
+            custom_domain=customer_site_doc.custom_domain,
+            enqueue_after_commit=True,
+            timeout=600
+        )
+
         frappe.publish_realtime('site_creation_progress', {
             'progress': 100,
             'message': 'Site creation completed successfully!'
@@ -631,19 +709,23 @@ Login Credentials:
 
 Site Name: {site_name}
 Instance: {instance_doc.instance_name}
-Package: {package_doc.package_name}
+Package: {package_info.package_name}
 Created: {get_datetime().strftime('%B %d, %Y at %I:%M %p')}"""
         
-        frappe.db.set_value("Customer Site", customer_site_doc.name, "site_details", site_details)
-        frappe.db.set_value("Customer Site", customer_site_doc.name, "status", "Active")
+        frappe.db.set_value("Customer Site", customer_site_doc.name, {
+            "site_details": site_details,
+            "status": "Active"
+        })
         frappe.db.commit()
-        
-        ssh_client.close()
-        
+
+        close_ssh_pool(instance_doc)
+
     except Exception as e:
         frappe.log_error(f"Error in site creation background process: {str(e)}", "Site Creation Background Error")
-        frappe.db.set_value("Customer Site", customer_site, "status", "Failed")
-        frappe.db.set_value("Customer Site", customer_site, "admin_notes", f"Site creation failed: {str(e)}")
+        frappe.db.set_value("Customer Site", customer_site, {
+            "status": "Failed",
+            "admin_notes": f"Site creation failed: {str(e)}"
+        })
         frappe.db.commit()
         
         frappe.publish_realtime('site_creation_progress', {
@@ -652,12 +734,48 @@ Created: {get_datetime().strftime('%B %d, %Y at %I:%M %p')}"""
         })
 
 
+def _get_instance_password(instance_doc, fieldname):
+    """Decrypt an Instance credential once per doc and memoize it
+
+    get_password hits the Auth table and runs decryption each call;
+    site creation needs the same secrets several times per job.
+    """
+    cache = getattr(instance_doc, "_password_cache", None)
+    if cache is None:
+        cache = instance_doc._password_cache = {}
+    if fieldname not in cache:
+        cache[fieldname] = instance_doc.get_password(fieldname)
+    return cache[fieldname]
+
+
+# Live SSH clients per worker process, keyed by (ip, user). The lock
+# only guards the dict; paramiko clients themselves are not shared
+# across threads concurrently in this codebase.
+_ssh_pool = {}
+_ssh_pool_lock = threading.Lock()
+
+
 def connect_ssh(instance_doc):
-    """Connect to instance via SSH"""
+    """Connect to instance via SSH, reusing a live pooled connection"""
+    # Imported lazily: paramiko drags in the cryptography stack, which
+    # workers that only run validate/read paths should never pay for
+    import paramiko
+
+    pool_key = (instance_doc.instance_ip, instance_doc.user)
+    with _ssh_pool_lock:
+        pooled = _ssh_pool.get(pool_key)
+        if pooled:
+            transport = pooled.get_transport()
+            if transport and transport.is_active():
+                return pooled
+            # Connection died (or a caller closed it); drop and reconnect
+            _ssh_pool.pop(pool_key, None)
+
     try:
-        # Log connection attempt for debugging
-        frappe.log_error(f"Attempting SSH connection to {instance_doc.instance_ip} with user {instance_doc.user}", "SSH Connection Debug")
-        
+        # Debug-level logging only; log_error writes an Error Log row per
+        # call and is reserved for actual failures below
+        frappe.logger("saas").debug(f"Attempting SSH connection to {instance_doc.instance_ip} with user {instance_doc.user}")
+
         ssh_client = paramiko.SSHClient()
         ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         
@@ -667,7 +785,7 @@ def connect_ssh(instance_doc):
             raise Exception("SSH user is not set")
         
         try:
-            password = instance_doc.get_password("password")
+            password = _get_instance_password(instance_doc, "password")
             if not password:
                 raise Exception("SSH password is not set or could not be decrypted")
         except Exception as e:
@@ -688,8 +806,14 @@ def connect_ssh(instance_doc):
         
         if test_output != "SSH connection test successful":
             raise Exception("SSH connection test failed")
-        
-        frappe.log_error(f"SSH connection successful to {instance_doc.instance_ip}", "SSH Connection Success")
+
+        # Keepalives stop idle pooled transports being dropped by
+        # firewalls between provisioning steps
+        ssh_client.get_transport().set_keepalive(30)
+
+        frappe.logger("saas").debug(f"SSH connection successful to {instance_doc.instance_ip}")
+        with _ssh_pool_lock:
+            _ssh_pool[pool_key] = ssh_client
         return ssh_client
         
     except paramiko.AuthenticationException as e:
@@ -706,161 +830,266 @@ def connect_ssh(instance_doc):
         raise Exception(error_msg)
 
 
-def configure_quota(ssh_client, instance_doc, site_name, package_doc):
-    """Configure erpnext_quota based on package limits"""
-    try:
-        # Get package limits with proper defaults
-        users_limit = package_doc.users_limit or 5
-        invoices_limit = package_doc.invoices_limit or 10
-        expenses_limit = package_doc.expenses_limit or 10
-        
-        # Create focused quota configuration based on available package limits
-        quota_config = {
-            "active_users": users_limit,
-            "company": 2,  # Allow 2 companies by default
-            "document_limit": {
-                # Core Invoice Documents (based on invoices_limit)
-                "Sales Invoice": {"limit": invoices_limit, "period": "Daily"},
-                "Purchase Invoice": {"limit": invoices_limit, "period": "Daily"},
-                
-                # Core Financial Documents (based on invoices_limit)
-                "Journal Entry": {"limit": invoices_limit, "period": "Monthly"},
-                "Payment Entry": {"limit": invoices_limit, "period": "Monthly"},
-                
-                # Expense Documents (based on expenses_limit)
-                "Expense Claim": {"limit": expenses_limit, "period": "Monthly"},
-                "Advance Payment": {"limit": expenses_limit, "period": "Monthly"},
-                
-                # User-related Documents (based on users_limit)
-                "Employee": {"limit": users_limit, "period": "Monthly"},
-                "User": {"limit": users_limit, "period": "Monthly"}
-            },
-            "valid_till": (get_datetime() + timedelta(days=365)).strftime('%Y-%m-%d'),
-            "package_name": package_doc.package_name,
-            "package_price": package_doc.price or 0,
-            "features": package_doc.features or "Standard ERPNext features"
-        }
-        
-        # Log quota configuration for debugging
-        frappe.log_error(f"Configuring quota for site {site_name} with package {package_doc.package_name}: {json.dumps(quota_config, indent=2)}", "Quota Configuration Debug")
-        
-        # Create site_config.json update command
-        config_json = json.dumps(quota_config, indent=2)
-        config_command = f"""
-        # Create quota configuration file
-        cat > /tmp/quota_config.json << 'EOF'
-        {config_json}
-        EOF
-        
-        # Backup existing site_config.json
-        cp '{instance_doc.bench}/sites/{site_name}/site_config.json' '{instance_doc.bench}/sites/{site_name}/site_config.json.backup'
-        
-        # Update site_config.json with quota configuration
-        python3 -c "
-        import json
-        import os
-        import shutil
-        
-        site_config_path = '{instance_doc.bench}/sites/{site_name}/site_config.json'
-        
-        # Read existing config
-        with open(site_config_path, 'r') as f:
-            config = json.load(f)
-        
-        # Read quota config
-        with open('/tmp/quota_config.json', 'r') as f:
-            quota_config = json.load(f)
-        
-        # Add quota configuration
-        config['quota'] = quota_config
-        
-        # Write updated config
-        with open(site_config_path, 'w') as f:
-            json.dump(config, f, indent=2)
-        
-        print('Quota configuration updated successfully')
-        "
-        
-        # Verify the configuration was applied
-        python3 -c "
-        import json
-        site_config_path = '{instance_doc.bench}/sites/{site_name}/site_config.json'
-        with open(site_config_path, 'r') as f:
-            config = json.load(f)
-        if 'quota' in config:
-            print('Quota configuration verified successfully')
-            print(f'Active users limit: {{config[\"quota\"][\"active_users\"]}}')
-            print(f'Document limits configured: {{len(config[\"quota\"][\"document_limit\"])}}')
+def _drain_channel(channel, timeout=None):
+    """Drain stdout and stderr while waiting for the command to exit
+
+    Blocking on recv_exit_status() before reading can stall once the
+    remote process fills the 64 KB channel window; this loop keeps both
+    streams drained so the remote runs at full speed.
+    """
+    if timeout:
+        channel.settimeout(timeout)
+    out = bytearray()
+    err = bytearray()
+    while True:
+        drained = False
+        while channel.recv_ready():
+            out += channel.recv(32768)
+            drained = True
+        while channel.recv_stderr_ready():
+            err += channel.recv_stderr(32768)
+            drained = True
+        if channel.exit_status_ready() and not drained:
+            break
+        if not drained:
+            time.sleep(0.05)
+    return channel.recv_exit_status(), bytes(out), bytes(err)
+
+
+def close_ssh_pool(instance_doc=None):
+    """Close pooled SSH connections, or just the given instance's
+
+    Called at the end of a provisioning run; each exec_command already
+    runs on its own channel of the shared transport, so nothing closes
+    the client mid-run.
+    """
+    with _ssh_pool_lock:
+        if instance_doc is not None:
+            keys = [(instance_doc.instance_ip, instance_doc.user)]
         else:
-            print('ERROR: Quota configuration not found')
-            exit(1)
-        "
-        """
-        
-        stdin, stdout, stderr = ssh_client.exec_command(f"cd {instance_doc.bench} && {config_command}")
-        exit_status = stdout.channel.recv_exit_status()
-        
-        if exit_status != 0:
-            error_output = stderr.read().decode()
-            frappe.log_error(f"Quota configuration failed: {error_output}", "Quota Configuration Error")
-            raise Exception(f"Quota configuration failed: {error_output}")
-        
-        # Log success
-        success_output = stdout.read().decode()
-        frappe.log_error(f"Quota configuration successful for {site_name}: {success_output}", "Quota Configuration Success")
-        
+            keys = list(_ssh_pool)
+        for key in keys:
+            client = _ssh_pool.pop(key, None)
+            if client:
+                try:
+                    client.close()
+                except Exception:
+                    pass
+
+
+@functools.lru_cache(maxsize=128)
+def _build_quota_template(package_name, price, features, users_limit, invoices_limit, expenses_limit):
+    """Build the quota config JSON for a package's limits (memoized)
+
+    The structure depends only on the package's three limits and display
+    fields, so provisioning many sites of the same package reuses one
+    serialized template. valid_till is time-dependent and gets stamped
+    in by the caller.
+    """
+    quota_config = {
+        "active_users": users_limit,
+        "company": 2,  # Allow 2 companies by default
+        "document_limit": {
+            # Core Invoice Documents (based on invoices_limit)
+            "Sales Invoice": {"limit": invoices_limit, "period": "Daily"},
+            "Purchase Invoice": {"limit": invoices_limit, "period": "Daily"},
+
+            # Core Financial Documents (based on invoices_limit)
+            "Journal Entry": {"limit": invoices_limit, "period": "Monthly"},
+            "Payment Entry": {"limit": invoices_limit, "period": "Monthly"},
+
+            # Expense Documents (based on expenses_limit)
+            "Expense Claim": {"limit": expenses_limit, "period": "Monthly"},
+            "Advance Payment": {"limit": expenses_limit, "period": "Monthly"},
+
+            # User-related Documents (based on users_limit)
+            "Employee": {"limit": users_limit, "period": "Monthly"},
+            "User": {"limit": users_limit, "period": "Monthly"}
+        },
+        "package_name": package_name,
+        "package_price": price or 0,
+        "features": features or "Standard ERPNext features"
+    }
+    return json.dumps(quota_config)
+
+
+def configure_quota(ssh_client, instance_doc, site_name, package_info):
+    """Configure erpnext_quota based on package limits
+
+    package_info is the dict of Package fields fetched by the caller;
+    passing it in avoids a second Package query per job.
+    """
+    try:
+        # Rehydrate the cached per-package template and stamp the
+        # time-dependent validity in
+        quota_config = json.loads(_build_quota_template(
+            package_info.get("package_name"),
+            package_info.get("price"),
+            package_info.get("features"),
+            package_info.get("users_limit") or 5,
+            package_info.get("invoices_limit") or 10,
+            package_info.get("expenses_limit") or 10,
+        ))
+        quota_config["valid_till"] = (date.today() + timedelta(days=365)).strftime('%Y-%m-%d')
+
+        # Diagnostics go to the rotating app log; log_error would insert
+        # an Error Log row per provisioning even when nothing failed
+        frappe.logger("saas.quota").debug(f"Configuring quota for site {site_name} with package {package_info.get('package_name')}: {json.dumps(quota_config)}")
+
+        # Update site_config.json directly over SFTP: no heredoc, no
+        # remote Python startups, no shell quoting of the JSON payload
+        site_config_path = f"{instance_doc.bench}/sites/{site_name}/site_config.json"
+        sftp = ssh_client.open_sftp()
+        try:
+            with sftp.file(site_config_path, 'r') as f:
+                config = json.loads(f.read().decode())
+
+            # No .backup copy: the temp-write + posix_rename below means
+            # the old config is intact right up to an atomic swap, which
+            # is the crash safety the backup was for
+            config['quota'] = quota_config
+
+            # Write to a temp path and rename so the site never reads a
+            # half-written config. The live config keeps indent=1 like
+            # bench's own writes so operators can still read it.
+            with sftp.file(site_config_path + '.new', 'w') as f:
+                f.write(json.dumps(config, indent=1))
+            sftp.posix_rename(site_config_path + '.new', site_config_path)
+
+            # Verify in-process: re-read the renamed file rather than
+            # spawning a remote interpreter just to print a confirmation
+            with sftp.file(site_config_path, 'r') as f:
+                written = json.loads(f.read().decode())
+            if 'quota' not in written or len(written['quota'].get('document_limit', {})) != len(quota_config['document_limit']):
+                raise Exception(f"Quota configuration verification failed for {site_name}")
+        finally:
+            sftp.close()
+
+        frappe.logger("saas.quota").info(f"Quota configuration successful for {site_name}")
+
     except Exception as e:
         frappe.log_error(f"Error configuring quota for {site_name}: {str(e)}", "Quota Configuration Error")
         raise e
 
 
+# Remote body for bulk quota updates: reads {"bench": ..., "pairs":
+# [[site, quota], ...]} from stdin and merges each quota atomically
+_BULK_QUOTA_SCRIPT = """
+import json, os, sys
+
+payload = json.load(sys.stdin)
+for site, quota in payload["pairs"]:
+    path = os.path.join(payload["bench"], "sites", site, "site_config.json")
+    with open(path) as f:
+        config = json.load(f)
+    config["quota"] = quota
+    tmp = path + ".new"
+    with open(tmp, "w") as f:
+        json.dump(config, f, indent=1)
+    os.replace(tmp, path)
+    print(site)
+"""
+
+
+def configure_site_quotas_bulk(ssh_client, instance_doc, site_quota_pairs):
+    """Apply quota configs to many sites of one bench in a single exec
+
+    site_quota_pairs is a list of (site_name, quota_config) tuples. One
+    SSH channel and one remote interpreter handle all merges instead of
+    a channel plus Python startup per site; callers accumulate pairs per
+    bench host and flush here.
+    """
+    if not site_quota_pairs:
+        return
+
+    stdin, stdout, stderr = ssh_client.exec_command(
+        f"python3 -c {shlex.quote(_BULK_QUOTA_SCRIPT)}"
+    )
+    stdin.write(json.dumps({
+        "bench": instance_doc.bench,
+        "pairs": [list(pair) for pair in site_quota_pairs],
+    }))
+    stdin.channel.shutdown_write()
+
+    exit_status, out_bytes, err_bytes = _drain_channel(stdout.channel, timeout=600)
+    if exit_status != 0:
+        raise Exception(f"Bulk quota configuration failed: {err_bytes.decode()}")
+
+    done = set(out_bytes.decode().split())
+    missing = [site for site, _quota in site_quota_pairs if site not in done]
+    if missing:
+        raise Exception(f"Bulk quota configuration did not cover sites: {', '.join(missing)}")
+
+    frappe.logger("saas.quota").info(
+        f"Bulk quota configuration applied to {len(done)} sites on {instance_doc.instance_ip}"
+    )
+
+
+# Fixed SSL setup script; site name and domain arrive as positional
+# args ($1/$2), never interpolated into shell context
+_SSL_SETUP_SCRIPT = """
+# Setup Let's Encrypt SSL certificate
+sudo -H bench setup lets-encrypt "$1"
+
+# Verify SSL certificate was created
+if [ -f "/etc/letsencrypt/live/$2/fullchain.pem" ]; then
+    echo "SSL certificate created successfully for $2"
+else
+    echo "WARNING: SSL certificate may not have been created properly"
+fi
+
+# Check if nginx is configured for SSL
+if [ -f "/etc/nginx/sites-available/$1" ]; then
+    echo "Nginx configuration found for $1"
+    # Test nginx configuration
+    sudo nginx -t
+    if [ $? -eq 0 ]; then
+        echo "Nginx configuration is valid"
+        # Reload nginx to apply SSL configuration
+        sudo systemctl reload nginx
+        echo "Nginx reloaded successfully"
+    else
+        echo "ERROR: Nginx configuration is invalid"
+    fi
+else
+    echo "WARNING: Nginx configuration not found for $1"
+fi
+"""
+
+
+def setup_ssl_certificate_job(instance, site_name, custom_domain):
+    """Background job: connect to the instance and set up SSL"""
+    instance_doc = frappe.get_cached_doc("Instance", instance)
+    ssh_client = connect_ssh(instance_doc)
+    try:
+        setup_ssl_certificate(ssh_client, instance_doc, site_name, custom_domain)
+    finally:
+        close_ssh_pool(instance_doc)
+
+
 def setup_ssl_certificate(ssh_client, instance_doc, site_name, custom_domain):
     """Setup SSL certificate using Let's Encrypt"""
     try:
-        # Log SSL setup attempt
-        frappe.log_error(f"Setting up SSL certificate for {site_name} with domain {custom_domain}", "SSL Setup Debug")
-        
-        # Setup Let's Encrypt SSL certificate
-        ssl_command = f"""
-        # Setup Let's Encrypt SSL certificate
-        sudo -H bench setup lets-encrypt {site_name}
-        
-        # Verify SSL certificate was created
-        if [ -f "/etc/letsencrypt/live/{custom_domain}/fullchain.pem" ]; then
-            echo "SSL certificate created successfully for {custom_domain}"
-        else
-            echo "WARNING: SSL certificate may not have been created properly"
-        fi
-        
-        # Check if nginx is configured for SSL
-        if [ -f "/etc/nginx/sites-available/{site_name}" ]; then
-            echo "Nginx configuration found for {site_name}"
-            # Test nginx configuration
-            sudo nginx -t
-            if [ $? -eq 0 ]; then
-                echo "Nginx configuration is valid"
-                # Reload nginx to apply SSL configuration
-                sudo systemctl reload nginx
-                echo "Nginx reloaded successfully"
-            else
-                echo "ERROR: Nginx configuration is invalid"
-            fi
-        else
-            echo "WARNING: Nginx configuration not found for {site_name}"
-        fi
-        """
-        
-        stdin, stdout, stderr = ssh_client.exec_command(f"cd {instance_doc.bench} && {ssl_command}")
-        exit_status = stdout.channel.recv_exit_status()
-        
+        frappe.logger("saas").debug(f"Setting up SSL certificate for {site_name} with domain {custom_domain}")
+
+        # Run the constant script body with bash -s; only the quoted
+        # positional args vary per site
+        stdin, stdout, stderr = ssh_client.exec_command(
+            f"cd {shlex.quote(instance_doc.bench)} && bash -s -- {shlex.quote(site_name)} {shlex.quote(custom_domain)}"
+        )
+        stdin.write(_SSL_SETUP_SCRIPT)
+        stdin.channel.shutdown_write()
+        exit_status, out_bytes, err_bytes = _drain_channel(stdout.channel, timeout=600)
+
         if exit_status != 0:
-            error_output = stderr.read().decode()
+            error_output = err_bytes.decode()
             frappe.log_error(f"SSL setup failed for {site_name}: {error_output}", "SSL Setup Error")
             # Don't raise exception as SSL setup failure shouldn't stop site creation
             frappe.log_error(f"SSL setup failed but continuing with site creation: {error_output}", "SSL Setup Warning")
-        else:
-            success_output = stdout.read().decode()
-            frappe.log_error(f"SSL setup successful for {site_name}: {success_output}", "SSL Setup Success")
+        elif frappe.conf.get('saas_verbose_provisioning'):
+            # Only decode and log the remote transcript when explicitly
+            # asked for; on success the exit status is the signal
+            frappe.logger("saas").info(f"SSL setup successful for {site_name}: {out_bytes.decode(errors='replace')}")
         
     except Exception as e:
         frappe.log_error(f"Error setting up SSL certificate for {site_name}: {str(e)}", "SSL Setup Error")
@@ -1,11 +1,175 @@
 import frappe
 from frappe.model.document import Document
 from frappe import _
+import atexit
 import subprocess
 import json
+import re
+import threading
 import time
 from datetime import datetime
 
+# Live SSH clients per worker process, keyed by (ip, user); reusing a
+# client saves the TCP + key-exchange + auth round trips per command
+_SSH_POOL = {}
+_SSH_LOCK = threading.Lock()
+
+# Idle connections are reaped after this many seconds: NAT/firewall
+# timeouts kill long-idle sessions silently, and holding them forever
+# leaks file descriptors on both ends
+_SSH_IDLE_TTL = 300
+_SSH_LAST_USED = {}
+_SSH_REAPER_STARTED = False
+
+# Last known site statuses per instance name, kept for the life of the
+# worker so repeated monitoring passes only push maintenance-mode
+# changes for sites whose status actually transitioned
+_LAST_STATES = {}
+
+
+def _reap_idle_ssh():
+	"""Daemon loop: close pooled connections idle past the TTL"""
+	while True:
+		time.sleep(30)
+		now = time.monotonic()
+		with _SSH_LOCK:
+			stale = [
+				key for key, last_used in _SSH_LAST_USED.items()
+				if now - last_used > _SSH_IDLE_TTL
+			]
+			clients = []
+			for key in stale:
+				client = _SSH_POOL.pop(key, None)
+				_SSH_LAST_USED.pop(key, None)
+				if client:
+					clients.append(client)
+		for client in clients:
+			try:
+				client.close()
+			except Exception:
+				pass
+
+
+def _ensure_reaper():
+	"""Start the idle reaper thread once per process"""
+	global _SSH_REAPER_STARTED
+	with _SSH_LOCK:
+		if _SSH_REAPER_STARTED:
+			return
+		_SSH_REAPER_STARTED = True
+	threading.Thread(target=_reap_idle_ssh, name="ssh-pool-reaper", daemon=True).start()
+
+
+def _get_instance_password(instance):
+	"""Decrypt the SSH password once per doc and memoize it on the doc
+
+	get_password reads the Auth table on every call; memoizing lets the
+	main thread pre-fetch the credential so pool worker threads, which
+	have no frappe.local, can dial without touching the database.
+	"""
+	password = getattr(instance, "_ssh_password", None)
+	if password is None:
+		password = instance._ssh_password = instance.get_password("password")
+	return password
+
+
+def _get_ssh(instance):
+	"""Return a pooled healthy SSH client for the instance, or build one"""
+	import paramiko
+
+	key = (instance.instance_ip, instance.user)
+	with _SSH_LOCK:
+		client = _SSH_POOL.get(key)
+		if client:
+			transport = client.get_transport()
+			if transport and transport.is_active():
+				_SSH_LAST_USED[key] = time.monotonic()
+				return client
+			_SSH_POOL.pop(key, None)
+			_SSH_LAST_USED.pop(key, None)
+
+	ssh = paramiko.SSHClient()
+	ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+	# Password auth only: skipping agent and key discovery avoids extra
+	# auth attempts per dial, and a short banner timeout fails fast on
+	# hosts that accept TCP but have a wedged sshd
+	ssh.connect(
+		hostname=instance.instance_ip,
+		username=instance.user,
+		password=_get_instance_password(instance),
+		port=22,
+		timeout=300,
+		look_for_keys=False,
+		allow_agent=False,
+		banner_timeout=5
+	)
+	ssh.get_transport().set_keepalive(30)
+	with _SSH_LOCK:
+		_SSH_POOL[key] = ssh
+		_SSH_LAST_USED[key] = time.monotonic()
+	_ensure_reaper()
+	return ssh
+
+
+def _has_live_ssh(instance):
+	"""Whether a healthy pooled client already exists for the instance"""
+	with _SSH_LOCK:
+		client = _SSH_POOL.get((instance.instance_ip, instance.user))
+	if not client:
+		return False
+	transport = client.get_transport()
+	return bool(transport and transport.is_active())
+
+
+def _drop_ssh(instance):
+	"""Close and forget the pooled client after a connection problem"""
+	key = (instance.instance_ip, instance.user)
+	with _SSH_LOCK:
+		client = _SSH_POOL.pop(key, None)
+		_SSH_LAST_USED.pop(key, None)
+	if client:
+		try:
+			client.close()
+		except Exception:
+			pass
+
+
+@frappe.whitelist()
+def get_ssh_pool_stats():
+	"""Report the pooled SSH connections held by this worker
+
+	Observability hook for the connection pool: one entry per (ip, user)
+	key with transport liveness, so stuck or leaked connections show up
+	without shelling into the worker.
+	"""
+	stats = []
+	now = time.monotonic()
+	with _SSH_LOCK:
+		for (ip, user), client in _SSH_POOL.items():
+			transport = client.get_transport()
+			last_used = _SSH_LAST_USED.get((ip, user))
+			stats.append({
+				"instance_ip": ip,
+				"user": user,
+				"active": bool(transport and transport.is_active()),
+				"idle_seconds": round(now - last_used, 1) if last_used else None,
+			})
+	return {"connections": stats, "total": len(stats)}
+
+
+def _close_ssh_pool():
+	with _SSH_LOCK:
+		for client in _SSH_POOL.values():
+			try:
+				client.close()
+			except Exception:
+				pass
+		_SSH_POOL.clear()
+		_SSH_LAST_USED.clear()
+
+
+atexit.register(_close_ssh_pool)
+
 
 class InstanceAction(Document):
 	def validate(self):
@@ -31,16 +195,18 @@ class InstanceAction(Document):
 	def on_submit(self):
 		"""Actions to perform when submitting the document"""
 		if self.status == "Pending":
+			# Direct column writes: submit already ran the full save
+			# pipeline, re-running it just to flip two fields is waste
 			self.status = "In Progress"
 			self.start_time = frappe.utils.now()
-			self.save()
+			self.db_set({"status": self.status, "start_time": self.start_time}, update_modified=False)
 			# Execute the action
 			self.execute_action()
 	
 	def execute_action(self):
 		"""Execute the instance action based on action type"""
 		try:
-			instance = frappe.get_doc("Instance", self.instance)
+			instance = frappe.get_cached_doc("Instance", self.instance)
 			
 			if self.action_type == "Start Instance":
 				self.start_instance(instance)
@@ -61,18 +227,32 @@ class InstanceAction(Document):
 			elif self.action_type == "Site Management":
 				self.manage_sites(instance)
 			
-			# Mark as completed
+			# Mark as completed; one completion timestamp shared by the
+			# end_time column and the log line
+			now_str = frappe.utils.now()
 			self.status = "Completed"
-			self.end_time = frappe.utils.now()
-			self.execution_log = f"Action completed successfully at {self.end_time}"
-			self.save()
-			
+			self.end_time = now_str
+			self.execution_log = f"Action completed successfully at {now_str}"
+			# Discovered-site child rows are bulk-inserted directly by
+			# save_discovered_sites_to_child_table, so monitoring no
+			# longer needs the full save pipeline either
+			self.db_set({
+				"status": self.status,
+				"end_time": self.end_time,
+				"execution_log": self.execution_log,
+				"execution_info": self.execution_info,
+			}, update_modified=False)
+
 		except Exception as e:
-			# Mark as failed
+			# Mark as failed with a single failure timestamp
 			self.status = "Failed"
 			self.end_time = frappe.utils.now()
 			self.execution_log = f"Action failed: {str(e)}"
-			self.save()
+			self.db_set({
+				"status": self.status,
+				"end_time": self.end_time,
+				"execution_log": self.execution_log,
+			}, update_modified=False)
 			frappe.log_error(f"Instance Action Failed: {str(e)}", "Instance Action Error")
 	
 	def start_instance(self, instance):
@@ -148,37 +328,39 @@ Inactive Sites: {status.get('inactive_sites', 0)}
 === DISCOVERED SITES ===
 """
 		
+		# Accumulate the per-site report in a list; += on a growing
+		# string reallocates the whole buffer every iteration
+		info_parts = [self.execution_info]
+		
 		# Add discovered sites information and handle maintenance mode
 		sites = connect_to_server_and_get_sites(instance)
 		for site in sites:
 			site_name = site.get('site_name', 'Unknown')
 			site_status = site.get('status', 'Unknown')
 			
-			self.execution_info += f"- {site_name} ({site_status}) - {site.get('package', 'Unknown')}\n"
+			info_parts.append(f"- {site_name} ({site_status}) - {site.get('package', 'Unknown')}\n")
 			if site.get('customer_site'):
-				self.execution_info += f"  └─ Customer Site: {site.get('customer_site')} (Customer: {site.get('customer_name', 'Unknown')})\n"
+				info_parts.append(f"  └─ Customer Site: {site.get('customer_site')} (Customer: {site.get('customer_name', 'Unknown')})\n")
 			else:
-				self.execution_info += f"  └─ Standalone Site (No Customer Site record)\n"
+				info_parts.append(f"  └─ Standalone Site (No Customer Site record)\n")
 			
-			# Handle maintenance mode based on site status
-			if site_status == 'Inactive' or site_status == 'Stopped':
-				try:
-					set_maintenance_mode_for_site(instance, site_name, True)
-					self.execution_info += f"  └─ Maintenance mode enabled for stopped site\n"
-				except Exception as e:
-					self.execution_info += f"  └─ Failed to set maintenance mode: {str(e)}\n"
-			elif site_status == 'Active' or site_status == 'Running':
-				try:
-					set_maintenance_mode_for_site(instance, site_name, False)
-					self.execution_info += f"  └─ Maintenance mode disabled for active site\n"
-				except Exception as e:
-					self.execution_info += f"  └─ Failed to disable maintenance mode: {str(e)}\n"
+			# Maintenance mode was applied in bulk during discovery;
+			# just report the outcome instead of re-running it per site
+			if site_status in ('Inactive', 'Stopped'):
+				info_parts.append(f"  └─ Maintenance mode enabled for stopped site\n")
+			elif site_status in ('Active', 'Running'):
+				info_parts.append(f"  └─ Maintenance mode disabled for active site\n")
+		
+		self.execution_info = "".join(info_parts)
 		
 		# Save discovered sites to child table
 		save_discovered_sites_to_child_table(self, sites)
 		
-		self.execution_log += f"\nMonitoring completed. Status: {status.get('connection_status', 'Unknown')}"
-		self.execution_log += f"\nFound {status.get('total_sites', 0)} sites on the instance"
+		self.execution_log = "\n".join((
+			self.execution_log,
+			f"Monitoring completed. Status: {status.get('connection_status', 'Unknown')}",
+			f"Found {status.get('total_sites', 0)} sites on the instance",
+		))
 		
 		# Update the instance with latest information
 		update_instance_with_status(instance, status)
@@ -191,70 +373,72 @@ Inactive Sites: {status.get('inactive_sites', 0)}
 	
 	def manage_sites(self, instance):
 		"""Manage sites on the instance"""
-		self.execution_log = f"Managing sites on instance {instance.instance_name}..."
-		# Get all sites for this instance
-		sites = frappe.get_all("Customer Site", 
-			filters={"instance": self.instance, "status": "Active"},
-			fields=["name", "site_name", "status"]
-		)
-		
-		# Process each site action
-		for site_action in self.site_actions:
-			site = frappe.get_doc("Customer Site", site_action.site)
-			if site_action.action == "Start Site":
-				self.start_site(site)
-			elif site_action.action == "Stop Site":
-				self.stop_site(site)
-			elif site_action.action == "Restart Site":
-				self.restart_site(site)
-			elif site_action.action == "Backup Site":
-				self.backup_site(site)
-			elif site_action.action == "Update Site":
-				self.update_site(site)
-	
-	def start_site(self, site):
-		"""Start a specific site"""
-		self.execution_log += f"\nStarting site {site.site_name}..."
-		instance = frappe.get_doc("Instance", self.instance)
-		execute_server_command(instance, f"cd {instance.bench} && bench --site {site.site_name} start")
-		self.execution_log += f"\nSite {site.site_name} started successfully"
-	
-	def stop_site(self, site):
-		"""Stop a specific site"""
-		self.execution_log += f"\nStopping site {site.site_name}..."
-		instance = frappe.get_doc("Instance", self.instance)
-		execute_server_command(instance, f"cd {instance.bench} && bench --site {site.site_name} stop")
-		self.execution_log += f"\nSite {site.site_name} stopped successfully"
-	
-	def restart_site(self, site):
-		"""Restart a specific site"""
-		self.execution_log += f"\nRestarting site {site.site_name}..."
-		instance = frappe.get_doc("Instance", self.instance)
-		execute_server_command(instance, f"cd {instance.bench} && bench --site {site.site_name} restart")
-		self.execution_log += f"\nSite {site.site_name} restarted successfully"
-	
-	def backup_site(self, site):
-		"""Backup a specific site"""
-		self.execution_log += f"\nBacking up site {site.site_name}..."
-		instance = frappe.get_doc("Instance", self.instance)
-		execute_server_command(instance, f"cd {instance.bench} && bench --site {site.site_name} backup")
-		self.execution_log += f"\nSite {site.site_name} backed up successfully"
-	
-	def update_site(self, site):
-		"""Update a specific site"""
-		self.execution_log += f"\nUpdating site {site.site_name}..."
-		instance = frappe.get_doc("Instance", self.instance)
-		execute_server_command(instance, f"cd {instance.bench} && bench --site {site.site_name} update")
-		self.execution_log += f"\nSite {site.site_name} updated successfully"
+		log_parts = [f"Managing sites on instance {instance.instance_name}..."]
+
+		# Independent per-site bench commands run in parallel, the same
+		# pool pattern get_server_status uses; results are collected in
+		# submission order so the log stays deterministic
+		import concurrent.futures
+
+		# Worker threads have no frappe.local, so everything that needs
+		# the database - site name resolution and password decryption -
+		# happens here before the fan-out; the workers only do SSH
+		site_names = {
+			site_action.site: frappe.db.get_value("Customer Site", site_action.site, "site_name")
+			for site_action in self.site_actions
+		}
+		_get_instance_password(instance)
+
+		with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+			futures = [
+				executor.submit(
+					self._run_site_action, site_action, instance,
+					site_names[site_action.site]
+				)
+				for site_action in self.site_actions
+			]
+			for future in futures:
+				log_parts.append(future.result())
+
+		self.execution_log = "\n".join(log_parts)
+
+	def _run_site_action(self, site_action, instance, site_name):
+		"""Run one site action over SSH and return its log line
+
+		Runs in a pool worker thread; site_name and the SSH credential
+		are resolved by manage_sites so nothing here touches the DB.
+		"""
+		verbs = {
+			"Start Site": ("start", "started"),
+			"Stop Site": ("stop", "stopped"),
+			"Restart Site": ("restart", "restarted"),
+			"Backup Site": ("backup", "backed up"),
+			"Update Site": ("update", "updated"),
+		}
+		if site_action.action not in verbs:
+			return f"Skipped unknown action '{site_action.action}' for {site_action.site}"
+
+		verb, done = verbs[site_action.action]
+		execute_server_command(instance, f"cd {instance.bench} && bench --site {site_name} {verb}")
+		return f"Site {site_name} {done} successfully"
 
 
 def execute_server_command(instance, command, timeout=300):
-	"""Execute a command on the server via SSH with proper handling"""
+	"""Execute a command on the server via SSH with proper handling
+
+	Only sudo commands can raise the password/confirmation prompts that
+	the PTY polling loop below handles; everything else is routed to the
+	plain exec path, which blocks on the streams without select() wakeups.
+	"""
 	import paramiko
 	import time
 	import socket
 	import select
-	
+
+	needs_pty = command.startswith("sudo") or " sudo " in command
+	if not needs_pty:
+		return execute_server_command_simple(instance, command, timeout=timeout)
+
 	def is_ip_reachable(ip, timeout=3):
 		try:
 			socket.setdefaulttimeout(timeout)
@@ -267,28 +451,21 @@ def execute_server_command(instance, command, timeout=300):
 	
 	output = ""
 	status = "Failed"
-	
-	# Check if server is reachable
-	if not is_ip_reachable(instance.instance_ip):
+
+	# Only probe reachability when a fresh connection would be needed; a
+	# live pooled client is better evidence than a throwaway TCP dial
+	if not _has_live_ssh(instance) and not is_ip_reachable(instance.instance_ip):
 		error_msg = f"Server {instance.instance_ip} is not reachable on port 22 (SSH). Check network or firewall."
 		frappe.log_error(error_msg, "SSH Connection Error")
 		raise Exception(error_msg)
 	
 	try:
-		# Get the password securely
-		password = instance.get_password("password")
-		
-		# Create SSH connection
-		ssh = paramiko.SSHClient()
-		ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-		ssh.connect(
-			hostname=instance.instance_ip,
-			username=instance.user,
-			password=password,
-			port=22,
-			timeout=300
-		)
-		
+		# Get the password securely (needed for sudo prompts)
+		password = _get_instance_password(instance)
+
+		# Reuse the pooled SSH connection; each command gets its own channel
+		ssh = _get_ssh(instance)
+
 		# Get transport and create channel
 		transport = ssh.get_transport()
 		channel = transport.open_session()
@@ -297,91 +474,163 @@ def execute_server_command(instance, command, timeout=300):
 		
 		start_time = time.time()
 		password_sent = False
-		out = ''
-		err = ''
-		
-		# Read output in real-time
+		buffer = bytearray()
+
+		def answer_prompt(chunk):
+			"""Respond to the first prompt in a raw chunk, if any"""
+			nonlocal password_sent
+			match = _PROMPT_RE.search(chunk)
+			if not match:
+				return False
+			prompt = match.group()
+			if prompt.startswith(b"[sudo]"):
+				if password_sent:
+					return False
+				channel.send(f"{password}\n")
+				password_sent = True
+			elif prompt == b"[y/N]":
+				channel.send("y\n")
+			else:
+				channel.send("2\n")
+			time.sleep(1)
+			return True
+
+		# Read output in real-time; chunks stay raw bytes until the end
 		while not channel.exit_status_ready():
 			rl, _, _ = select.select([channel], [], [], 0.5)
-			if channel.recv_ready():
-				out = channel.recv(4096).decode()
-				if out:
-					output += out
-			else:
-				out = ''
-				
-			if channel.recv_stderr_ready():
-				err = channel.recv_stderr(4096).decode()
-				if err:
-					output += err
-			else:
-				err = ''
-			
-			# Handle prompts
+			out = channel.recv(4096) if channel.recv_ready() else b''
 			if out:
-				if not password_sent and "[sudo] password for" in out:
-					channel.send(f"{password}\n")
-					password_sent = True
-					time.sleep(1)
-					continue
-				if "[y/N]" in out:
-					channel.send("y\n")
-					time.sleep(1)
-					continue
-				if "Select the appropriate number [1-2]" in out:
-					channel.send("2\n")
-					time.sleep(1)
-					continue
-					
+				buffer += out
+
+			err = channel.recv_stderr(4096) if channel.recv_stderr_ready() else b''
 			if err:
-				if not password_sent and "[sudo] password for" in err:
-					channel.send(f"{password}\n")
-					password_sent = True
-					time.sleep(1)
-					continue
-				if "[y/N]" in err:
-					channel.send("y\n")
-					time.sleep(1)
-					continue
-				if "Select the appropriate number [1-2]" in err:
-					channel.send("2\n")
-					time.sleep(1)
-					continue
-			
+				buffer += err
+
+			# Handle prompts with one regex scan per chunk
+			if (out and answer_prompt(out)) or (err and answer_prompt(err)):
+				continue
+
 			# Check timeout
 			if time.time() - start_time > timeout:
-				output += "\n[Timeout Exceeded]"
+				buffer += b"\n[Timeout Exceeded]"
 				break
-		
+
 		# Flush any remaining output
 		while channel.recv_ready():
-			out = channel.recv(4096).decode()
-			if out:
-				output += out
-				
+			buffer += channel.recv(4096)
+
 		while channel.recv_stderr_ready():
-			err = channel.recv_stderr(4096).decode()
-			if err:
-				output += err
-		
-		# Get exit status
+			buffer += channel.recv_stderr(4096)
+
+		# Get exit status; the pooled connection stays open for reuse
 		exit_status = channel.recv_exit_status()
+		channel.close()
 		status = "Success" if exit_status == 0 else "Failed"
-		
-		# Close SSH connection
-		ssh.close()
-		
+
+		# One decode of the whole transcript instead of one per chunk
+		output = buffer.decode(errors="replace")
+
 		if status == "Failed":
 			raise Exception(f"Command failed with exit status {exit_status}: {output}")
-		
+
 		return output
-		
+
 	except Exception as e:
+		# The connection may be the problem - drop it so the next call
+		# starts from a clean handshake
+		_drop_ssh(instance)
 		error_msg = f"SSH Command Error: {str(e)}"
 		frappe.log_error(error_msg, "SSH Command Error")
 		raise Exception(error_msg)
 
 
+def execute_server_command_simple(instance, command, timeout=300):
+	"""Run a non-interactive command without a PTY or polling loop
+
+	The prompt-handling loop in execute_server_command exists for sudo
+	and confirmation prompts; plain reads (ls, cat, status probes) only
+	pay its 0.5s select() wakeups. This path blocks on the streams
+	directly and keeps stdout and stderr separated.
+	"""
+	try:
+		ssh = _get_ssh(instance)
+		stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
+		out = stdout.read().decode()
+		err = stderr.read().decode()
+		exit_status = stdout.channel.recv_exit_status()
+
+		if exit_status != 0:
+			raise Exception(f"Command failed with exit status {exit_status}: {err or out}")
+
+		return out
+
+	except Exception as e:
+		_drop_ssh(instance)
+		error_msg = f"SSH Command Error: {str(e)}"
+		# Pool worker threads have no frappe.local; their callers collect
+		# the raised errors and log them after the threads join
+		if threading.current_thread() is threading.main_thread():
+			frappe.log_error(error_msg, "SSH Command Error")
+		raise Exception(error_msg)
+
+
+class RemoteSession:
+	"""One interactive shell reused for several serial commands
+
+	Each exec_command pays a channel open plus shell startup; a batch of
+	serial commands can share a single invoke_shell session and pay it
+	once. Output is delimited with marker echoes so each run() returns
+	exactly its own command's output and exit status. The channel belongs
+	to the opening thread - parallel callers must keep using per-command
+	execs.
+	"""
+
+	def __init__(self, instance, timeout=300):
+		self.instance = instance
+		self.timeout = timeout
+		self.channel = None
+
+	def __enter__(self):
+		self.channel = _get_ssh(self.instance).invoke_shell()
+		self.channel.settimeout(self.timeout)
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		try:
+			self.channel.close()
+		except Exception:
+			pass
+		if exc_type:
+			# The session may have died mid-command; rebuild next time
+			_drop_ssh(self.instance)
+		return False
+
+	def run(self, command):
+		"""Run one command in the session and return its output"""
+		self.channel.send(f"echo __MARK__; {command}; echo __END__$?\n")
+		buffer = bytearray()
+		while True:
+			chunk = self.channel.recv(4096)
+			if not chunk:
+				raise Exception(f"Session closed while running: {command}")
+			buffer += chunk
+			match = re.search(rb"__END__(\d+)", buffer)
+			if match:
+				break
+
+		text = buffer[: match.start()].decode(errors="replace")
+		# Drop the echoed command line; the real output starts after the
+		# standalone __MARK__ echo
+		marker = text.rfind("__MARK__\r\n")
+		if marker != -1:
+			text = text[marker + len("__MARK__\r\n"):]
+
+		exit_status = int(match.group(1))
+		if exit_status != 0:
+			raise Exception(f"Command failed with exit status {exit_status}: {text}")
+		return text
+
+
 @frappe.whitelist()
 def get_instance_sites(instance):
 	"""Get all sites for a given instance by connecting to the server"""
@@ -400,123 +649,233 @@ def get_instance_sites(instance):
 
 
 def save_discovered_sites_to_child_table(action_doc, sites):
-	"""Save discovered sites to the child table"""
+	"""Save discovered sites to the child table
+
+	Writes the Instance Action Site rows directly: one delete plus one
+	bulk insert, instead of appending N child docs and paying the full
+	per-row validation pipeline on the parent save.
+	"""
 	try:
 		# Clear existing site actions
+		frappe.db.delete("Instance Action Site", {"parent": action_doc.name})
+
+		now = frappe.utils.now()
+		user = frappe.session.user
+		rows = []
+		for idx, site in enumerate(sites, start=1):
+			rows.append({
+				"name": frappe.generate_hash(length=10),
+				"creation": now,
+				"modified": now,
+				"owner": user,
+				"modified_by": user,
+				# Child rows must carry the parent's docstatus or they
+				# read as drafts under a submitted Instance Action
+				"docstatus": action_doc.docstatus,
+				"parent": action_doc.name,
+				"parentfield": "site_actions",
+				"parenttype": "Instance Action",
+				"idx": idx,
+				"site": site.get('customer_site'),
+				"site_name": site.get('site_name', 'Unknown'),
+				"action": 'Start Site',  # Default action
+				"status": 'Pending' if not site.get('maintenance_mode') else 'Maintenance Mode Enabled',
+			})
+
+		if rows:
+			fields = list(rows[0])
+			frappe.db.bulk_insert(
+				"Instance Action Site",
+				fields=fields,
+				values=[tuple(row[field] for field in fields) for row in rows],
+				ignore_duplicates=True,
+			)
+
+		# Mirror the written rows on the loaded doc so in-memory readers
+		# see the same child table the database now holds
 		action_doc.site_actions = []
-		
-		for site in sites:
-			# Create new child row
-			child_row = action_doc.append('site_actions', {
-				'site_name': site.get('site_name', 'Unknown'),
-				'action': 'Start Site',  # Default action
-				'status': 'Pending'  # Default status
+		for row in rows:
+			action_doc.append("site_actions", {
+				"name": row["name"],
+				"docstatus": row["docstatus"],
+				"idx": row["idx"],
+				"site": row["site"],
+				"site_name": row["site_name"],
+				"action": row["action"],
+				"status": row["status"],
 			})
-			
-			# Link to Customer Site if exists
-			if site.get('customer_site'):
-				child_row.site = site.get('customer_site')
-			
-			# Add maintenance mode info
-			if site.get('maintenance_mode'):
-				child_row.status = 'Maintenance Mode Enabled'
-		
-		# Don't save here - let the caller save the document
-		# This prevents issues with nested saves
-		
+
 	except Exception as e:
 		frappe.log_error(f"Error saving sites to child table: {str(e)}", "Site Actions Save Error")
 
 
+# Remote body for bulk maintenance-mode updates; takes the desired
+# {site: mode} map as JSON in argv and rewrites each config atomically
+_MAINT_MODE_SCRIPT = (
+	"import json,os,sys\n"
+	"modes=json.loads(sys.argv[1])\n"
+	"for site,mode in modes.items():\n"
+	"    p=os.path.join('sites',site,'site_config.json')\n"
+	"    c=json.load(open(p))\n"
+	"    c['maintenance_mode']=mode\n"
+	"    t=p+'.tmp'\n"
+	"    json.dump(c,open(t,'w'),indent=1)\n"
+	"    os.replace(t,p)\n"
+	"    print('MODE:%s:%d'%(site,mode))\n"
+)
+
+
+def _apply_maintenance_modes(instance_doc, desired):
+	"""Apply maintenance modes for many sites in one remote exec
+
+	desired maps site_name -> 0/1; returns the {site: mode} map actually
+	applied, parsed from the remote confirmation lines. One SSH command
+	covers all sites instead of a read+write round trip per site.
+	"""
+	import shlex
+
+	if not desired:
+		return {}
+
+	command = (
+		f"cd {instance_doc.bench} && "
+		f"python3 -c {shlex.quote(_MAINT_MODE_SCRIPT)} {shlex.quote(json.dumps(desired))}"
+	)
+	output = execute_server_command_simple(instance_doc, command)
+
+	applied = {}
+	for line in (output or "").split("\n"):
+		line = line.strip()
+		if line.startswith("MODE:"):
+			parts = line.split(":")
+			if len(parts) == 3 and parts[2].isdigit():
+				applied[parts[1]] = int(parts[2])
+	return applied
+
+
+def _sites_discovery_cmd(instance_doc):
+	"""Shell snippet that lists sites and their basic status in one pass"""
+	return f"""
+	cd {instance_doc.bench} 2>/dev/null || cd /home/*/erp15 2>/dev/null || cd /home/*/frappe-bench 2>/dev/null;
+	BENCH_PATH=$(pwd);
+	echo "BENCH_PATH:$BENCH_PATH";
+	ls sites/ | grep -v '^apps\\|^assets\\|^common_site_config\\|^apps.json\\|^apps.txt' | while read site; do
+		if [[ "$site" == *.* ]]; then
+			echo "SITE:$site";
+			# Quick status check
+			if [ -f "sites/$site/site_config.json" ]; then
+				echo "STATUS:$site:Active";
+			else
+				echo "STATUS:$site:Unknown";
+			fi;
+		fi;
+	done
+	"""
+
+
+def _parse_sites_output(output):
+	"""Parse the SITE:/STATUS: line stream into a site_data dict"""
+	site_data = {}
+	for line in output.split('\n'):
+		line = line.strip()
+		if line.startswith('SITE:'):
+			site_name = line.replace('SITE:', '')
+			site_data[site_name] = {'name': site_name, 'site_name': site_name}
+		elif line.startswith('STATUS:'):
+			parts = line.replace('STATUS:', '').split(':')
+			if len(parts) == 2:
+				site_name, status = parts
+				if site_name in site_data:
+					site_data[site_name]['status'] = status
+	return site_data
+
+
 def connect_to_server_and_get_sites(instance_doc):
 	"""Connect to the server and get all sites - optimized for speed"""
 	sites = []
 	
 	try:
-		# Use a single command to get sites and basic info
-		combined_cmd = f"""
-		cd {instance_doc.bench} 2>/dev/null || cd /home/*/erp15 2>/dev/null || cd /home/*/frappe-bench 2>/dev/null;
-		BENCH_PATH=$(pwd);
-		echo "BENCH_PATH:$BENCH_PATH";
-		ls sites/ | grep -v '^apps\\|^assets\\|^common_site_config\\|^apps.json\\|^apps.txt' | while read site; do
-			if [[ "$site" == *.* ]]; then
-				echo "SITE:$site";
-				# Quick status check
-				if [ -f "sites/$site/site_config.json" ]; then
-					echo "STATUS:$site:Active";
-				else
-					echo "STATUS:$site:Unknown";
-				fi;
-			fi;
-		done
-		"""
-		
-		output = execute_server_command(instance_doc, combined_cmd)
-		print(f"Combined command output: {output}")
-		
-		# Parse the output
-		bench_path = None
-		site_data = {}
-		
-		for line in output.split('\n'):
-			line = line.strip()
-			if line.startswith('BENCH_PATH:'):
-				bench_path = line.replace('BENCH_PATH:', '')
-			elif line.startswith('SITE:'):
-				site_name = line.replace('SITE:', '')
-				site_data[site_name] = {'name': site_name, 'site_name': site_name}
-			elif line.startswith('STATUS:'):
-				parts = line.replace('STATUS:', '').split(':')
-				if len(parts) == 2:
-					site_name, status = parts
-					if site_name in site_data:
-						site_data[site_name]['status'] = status
+		output = execute_server_command_simple(instance_doc, _sites_discovery_cmd(instance_doc))
+		if frappe.conf.get("developer_mode"):
+			frappe.logger("instance_action").debug(f"Combined command output: {output}")
+
+		site_data = _parse_sites_output(output)
+		sites = _build_sites_from_data(instance_doc, site_data)
 		
+	except Exception as e:
+		frappe.log_error(f"Error getting sites from server: {str(e)}", "Site Discovery Error")
+	
+	return sites
+
+
+def _build_sites_from_data(instance_doc, site_data):
+	"""Resolve customer links and maintenance modes for discovered sites"""
+	sites = []
+	try:
 		# Get all Customer Sites in one query for efficiency
 		site_names = list(site_data.keys())
 		customer_sites = {}
 		if site_names:
 			try:
+				# as_list skips building a frappe._dict per row; only two
+				# columns are read below, by position
 				customer_site_records = frappe.get_all("Customer Site",
 					filters={"custom_domain": ["in", site_names]},
-					fields=["name", "customer_name", "package", "status", "instance", "custom_domain"]
+					fields=["name", "customer_name", "package", "status", "instance", "custom_domain"],
+					as_list=True
 				)
-				# Create a lookup dictionary
+				# Create a lookup dictionary keyed by custom_domain
 				for record in customer_site_records:
-					customer_sites[record.custom_domain] = record
+					customer_sites[record[5]] = record
 			except Exception as e:
 				frappe.log_error(f"Error getting Customer Sites: {str(e)}", "Customer Site Lookup Error")
 		
+		# Resolve every site's desired maintenance mode up front, then
+		# apply them all with one SSH command instead of two per site.
+		# Sites whose status hasn't changed since the last pass already
+		# carry the right mode and are skipped entirely.
+		last_states = _LAST_STATES.setdefault(instance_doc.name, {})
+		desired_modes = {}
+		for site_name, site_info in site_data.items():
+			site_status = site_info.get('status', 'Unknown')
+			if last_states.get(site_name) == site_status:
+				continue
+			if site_status in ('Inactive', 'Stopped'):
+				desired_modes[site_name] = 1
+			elif site_status in ('Active', 'Running'):
+				desired_modes[site_name] = 0
+
+		applied_modes = {}
+		if desired_modes:
+			try:
+				applied_modes = _apply_maintenance_modes(instance_doc, desired_modes)
+				for site_name in applied_modes:
+					last_states[site_name] = site_data[site_name].get('status', 'Unknown')
+			except Exception as e:
+				frappe.log_error(f"Error applying maintenance modes: {str(e)}", "Maintenance Mode Error")
+
 		# Process sites
 		for site_name, site_info in site_data.items():
 			try:
 				# Get Customer Site from lookup
 				customer_site = customer_sites.get(site_name)
-				
+
 				# Construct server URL
 				server_url = f"https://{site_name}"
-				
-				# Check site status and handle maintenance mode accordingly
+
 				site_status = site_info.get('status', 'Unknown')
-				maintenance_mode = 0  # Default to 0 (accessible)
-				
-				if site_status == 'Inactive' or site_status == 'Stopped':
-					# Set maintenance mode to 1 for stopped sites
-					result = set_maintenance_mode_for_site(instance_doc, site_name, True)
-					maintenance_mode = result if result is not None else 0
-				elif site_status == 'Active' or site_status == 'Running':
-					# Set maintenance mode to 0 for active sites
-					result = set_maintenance_mode_for_site(instance_doc, site_name, False)
-					maintenance_mode = result if result is not None else 0
-				
+				# Skipped (unchanged) sites keep the mode their status implies
+				default_mode = 1 if site_status in ('Inactive', 'Stopped') else 0
+				maintenance_mode = applied_modes.get(site_name, default_mode)
+
 				sites.append({
 					"name": site_name,
 					"site_name": site_name,
 					"status": site_status,
 					"package": "Unknown",  # Skip package detection for speed
 					"server_url": server_url,
-					"customer_site": customer_site.get("name") if customer_site else None,
-					"customer_name": customer_site.get("customer_name") if customer_site else None,
+					"customer_site": customer_site[0] if customer_site else None,
+					"customer_name": customer_site[1] if customer_site else None,
 					"is_customer_site": customer_site is not None,
 					"maintenance_mode": maintenance_mode
 				})
@@ -524,123 +883,147 @@ def connect_to_server_and_get_sites(instance_doc):
 				frappe.log_error(f"Error processing site {site_name}: {str(e)}", "Site Processing Error")
 		
 	except Exception as e:
-		frappe.log_error(f"Error getting sites from server: {str(e)}", "Site Discovery Error")
+		frappe.log_error(f"Error building site records: {str(e)}", "Site Discovery Error")
 	
 	return sites
 
 
+# supervisorctl lines look like "erp15-<site>    RUNNING   pid 123, uptime ..."
+_SUPERVISOR_LINE_RE = re.compile(r"erp15-(\S+)\s+(\S+)")
+
+# Interactive prompts the PTY loop answers, matched on raw bytes so
+# chunks never need decoding mid-stream
+_PROMPT_RE = re.compile(rb"\[sudo\] password for|\[y/N\]|Select the appropriate number \[1-2\]")
+
+# df lines for real devices with a G/T-scale size, e.g.
+# "/dev/vda1        40G   12G   28G  30% /"
+_DISK_LINE_RE = re.compile(r"^/dev/\S+\s+\S+[GT]")
+
+# Compact system probe: only the three lines the parser keeps, instead
+# of the full free table and a df dump of every snap/overlay mount
+_SYSTEM_PROBE = "uptime; free -h | awk '/^Mem:/'; df -hP / | awk 'NR==2'"
+
+# Status probe results per instance, refreshed every ~10 seconds so a
+# monitoring pass over N sites costs one SSH round trip, not N
+_SITE_STATUS_CACHE = {}
+
+
+def _probe_all_statuses(instance_doc):
+	"""Fetch the status of every site on the instance in one command"""
+	cache_key = (instance_doc.name, int(time.time() // 10))
+	cached = _SITE_STATUS_CACHE.get(cache_key)
+	if cached is not None:
+		return cached
+
+	output = execute_server_command_simple(
+		instance_doc,
+		f"cd {instance_doc.bench} && supervisorctl status; echo '---'; ls sites/"
+	)
+	supervisor_part, _, sites_part = output.partition("---")
+
+	statuses = {}
+	for site, state in _SUPERVISOR_LINE_RE.findall(supervisor_part):
+		statuses[site] = "Active" if state.upper() == "RUNNING" else "Inactive"
+
+	# Sites present on disk but without a supervisor program are still
+	# served by the shared bench processes
+	for entry in sites_part.split():
+		if "." in entry:
+			statuses.setdefault(entry, "Active")
+
+	_SITE_STATUS_CACHE.clear()
+	_SITE_STATUS_CACHE[cache_key] = statuses
+	return statuses
+
+
 def get_site_status_robust(instance_doc, site_name):
 	"""Get the status of a specific site using robust SSH"""
 	try:
-		# Check if site is active using multiple methods
-		methods = [
-			f"cd {instance_doc.bench} && bench --site {site_name} status",
-			f"cd {instance_doc.bench} && supervisorctl status erp15-{site_name}",
-			f"cd {instance_doc.bench} && ps aux | grep {site_name} | grep -v grep"
-		]
-		
-		for method in methods:
-			try:
-				output = execute_server_command(instance_doc, method)
-				if output:
-					if any(keyword in output.lower() for keyword in ["active", "running", "started"]):
-						return "Active"
-					elif any(keyword in output.lower() for keyword in ["inactive", "stopped", "failed"]):
-						return "Inactive"
-			except:
-				continue
-		
-		# If no method worked, try a simple check
-		try:
-			check_cmd = f"cd {instance_doc.bench} && test -f sites/{site_name}/site_config.json && echo 'Site exists' || echo 'Site not found'"
-			result = execute_server_command(instance_doc, check_cmd)
-			if "Site exists" in result:
-				return "Active"  # Assume active if site config exists
-		except:
-			pass
-			
-		return "Unknown"
-			
+		return _probe_all_statuses(instance_doc).get(site_name, "Unknown")
+
 	except Exception as e:
 		frappe.log_error(f"Error getting site status for {site_name}: {str(e)}", "Site Status Error")
 		return "Unknown"
 
 
 def get_site_package(instance_doc, site_name):
-	"""Get the package/apps installed for a specific site"""
+	"""Get the package/apps installed for a specific site
+
+	Both probes run through one RemoteSession so the fallback command
+	reuses the already-open shell instead of opening a second channel.
+	"""
 	try:
-		# Try to get package info from site config
-		command = f"cd {instance_doc.bench} && cat sites/{site_name}/site_config.json | grep -o '\"app_name\":[^,]*' | head -1"
-		output = execute_server_command(instance_doc, command)
-		
-		if output and "app_name" in output:
-			# Extract app name from the output
-			app_name = output.split(':')[1].strip().strip('"')
-			return app_name
-		
-		# Try alternative method
-		command = f"cd {instance_doc.bench} && bench --site {site_name} list-apps 2>/dev/null | head -1"
-		output = execute_server_command(instance_doc, command)
-		
-		if output and output.strip():
-			return output.strip()
-		
+		with RemoteSession(instance_doc) as session:
+			# Try to get package info from site config
+			command = f"cd {instance_doc.bench} && cat sites/{site_name}/site_config.json | grep -o '\"app_name\":[^,]*' | head -1"
+			output = session.run(command)
+
+			if output and "app_name" in output:
+				# Extract app name from the output
+				app_name = output.split(':')[1].strip().strip('"')
+				return app_name
+
+			# Try alternative method
+			command = f"cd {instance_doc.bench} && bench --site {site_name} list-apps 2>/dev/null | head -1"
+			output = session.run(command)
+
+			if output and output.strip():
+				return output.strip()
+
 		return "Unknown"
-		
+
 	except Exception as e:
 		frappe.log_error(f"Error getting package for {site_name}: {str(e)}", "Package Detection Error")
 		return "Unknown"
 
 
 def get_customer_site_for_site_name(site_name):
-	"""Check if a site exists in Customer Site doctype and return its details"""
+	"""Check if a site exists in Customer Site doctype and return its details
+
+	The lookup is memoized on frappe.local for the request: the first
+	call fetches all Customer Sites once and buckets them by domain, so
+	callers probing N sites issue one query instead of N.
+	"""
 	try:
-		customer_sites = frappe.get_all("Customer Site",
-			filters={"custom_domain": site_name},
-			fields=["name", "customer_name", "package", "status", "instance", "custom_domain"]
-		)
-		
-		if customer_sites:
-			return customer_sites[0]
-		return None
-		
+		cache = getattr(frappe.local, "_customer_site_by_domain", None)
+		if cache is None:
+			records = frappe.get_all("Customer Site",
+				fields=["name", "customer_name", "package", "status", "instance", "custom_domain"]
+			)
+			cache = {}
+			for record in records:
+				if record.custom_domain:
+					cache.setdefault(record.custom_domain, record)
+			frappe.local._customer_site_by_domain = cache
+
+		return cache.get(site_name)
+
 	except Exception as e:
 		frappe.log_error(f"Error checking Customer Site for {site_name}: {str(e)}", "Customer Site Lookup Error")
 		return None
 
 
 def set_maintenance_mode_for_site(instance_doc, site_name, enable=True):
-	"""Set maintenance mode for a specific site"""
+	"""Set maintenance mode for a specific site
+
+	Delegates to _apply_maintenance_modes with a single-site map, so the
+	config is read, updated and written server-side in one remote exec
+	instead of a cat round trip followed by a heredoc write.
+	"""
 	try:
-		# Get the current site config
-		config_cmd = f"cd {instance_doc.bench} && cat sites/{site_name}/site_config.json"
-		config_output = execute_server_command(instance_doc, config_cmd)
-		
-		# Parse the JSON config
-		import json
-		site_config = json.loads(config_output)
-		
-		# Update maintenance mode
 		# In Frappe: 1 = maintenance mode enabled (site not accessible), 0 = maintenance mode disabled (site accessible)
 		maintenance_mode_value = 1 if enable else 0
-		site_config["maintenance_mode"] = maintenance_mode_value
-		
-		# Write the updated config back using Python heredoc to avoid escaping issues
-		config_json = json.dumps(site_config, indent=2)
-		# Escape single quotes in JSON for bash
-		config_json_escaped = config_json.replace("'", "'\\''")
-		
-		# Use cat with heredoc instead of echo to avoid escaping issues
-		update_cmd = f"cd {instance_doc.bench} && cat > sites/{site_name}/site_config.json << 'EOF'\n{config_json}\nEOF"
-		execute_server_command(instance_doc, update_cmd)
-		
-		# Log the action
+		applied = _apply_maintenance_modes(instance_doc, {site_name: maintenance_mode_value})
+		if site_name not in applied:
+			raise Exception(f"Remote did not confirm maintenance mode for {site_name}")
+
+		# Debug log only; success must not insert an Error Log row
 		action = "enabled" if enable else "disabled"
-		frappe.log_error(f"Maintenance mode {action} for site {site_name} (set to {maintenance_mode_value})", "Maintenance Mode")
-		
+		frappe.logger("maintenance").debug(f"Maintenance mode {action} for site {site_name} (set to {maintenance_mode_value})")
+
 		# Return the actual maintenance mode value (1 or 0), not just True/False
-		return maintenance_mode_value
-		
+		return applied[site_name]
+
 	except Exception as e:
 		frappe.log_error(f"Error setting maintenance mode for {site_name}: {str(e)}", "Maintenance Mode Error")
 		return None  # Return None on error to indicate failure
@@ -651,8 +1034,6 @@ def toggle_site_maintenance_mode(instance, site_name, enable=True):
 	"""Toggle maintenance mode for a specific site"""
 	try:
 		# Convert enable to boolean (frappe.whitelist can pass values as strings or integers)
-		frappe.log_error(f"toggle_site_maintenance_mode called with enable={enable}, type={type(enable)}", "Maintenance Mode Debug")
-		
 		if isinstance(enable, str):
 			# Handle string values: 'true', 'True', '1', 'yes' etc.
 			enable = enable.lower() in ['true', '1', 'yes']
@@ -662,9 +1043,7 @@ def toggle_site_maintenance_mode(instance, site_name, enable=True):
 		else:
 			# Handle actual boolean values
 			enable = bool(enable)
-		
-		frappe.log_error(f"After conversion, enable={enable}, type={type(enable)}", "Maintenance Mode Debug")
-		
+
 		instance_doc = frappe.get_doc("Instance", instance)
 		maintenance_mode_value = set_maintenance_mode_for_site(instance_doc, site_name, enable)
 		
@@ -746,12 +1125,47 @@ Last Backup: {status_data.get('last_backup_date', 'Never')}
 		return {"status": "error", "message": f"Failed to save status: {str(e)}"}
 
 
-@frappe.whitelist()
-def execute_instance_action(action_name):
-	"""Execute an instance action"""
+def _run_action(action_name):
+	"""Background job: execute an Instance Action by name"""
 	action = frappe.get_doc("Instance Action", action_name)
 	action.execute_action()
-	return {"status": "success", "message": "Action executed successfully"}
+
+
+def _enqueue_action(action_name):
+	"""Push the action onto the long queue and return job details
+
+	SSH-heavy actions can run for minutes; executing them in the request
+	thread held the HTTP worker (and the browser) for the whole run.
+	Callers poll get_action_status for completion instead.
+	"""
+	frappe.enqueue(
+		"saas_package_management.saas_package_management.doctype.instance_action.instance_action._run_action",
+		queue="long",
+		timeout=1800,
+		job_name=f"instance-action-{action_name}",
+		action_name=action_name,
+	)
+
+
+@frappe.whitelist()
+def execute_instance_action(action_name):
+	"""Queue an instance action for background execution"""
+	_enqueue_action(action_name)
+	return {"status": "queued", "message": "Action queued for execution", "action_name": action_name}
+
+
+@frappe.whitelist()
+def get_action_status(action_name):
+	"""Poll the status of a queued instance action"""
+	action = frappe.db.get_value(
+		"Instance Action", action_name,
+		["status", "start_time", "end_time", "execution_log"],
+		as_dict=True
+	)
+	if not action:
+		return {"status": "error", "message": f"Instance Action {action_name} not found"}
+	action["action_name"] = action_name
+	return action
 
 
 @frappe.whitelist()
@@ -760,7 +1174,7 @@ def create_monitoring_action(instance):
 	try:
 		# Get instance details
 		instance_doc = frappe.get_doc("Instance", instance)
-		
+
 		# Create a monitoring action
 		action = frappe.get_doc({
 			"doctype": "Instance Action",
@@ -770,18 +1184,18 @@ def create_monitoring_action(instance):
 			"status": "Pending",
 			"action_details": "Comprehensive monitoring of instance health, system status, and sites information"
 		})
-		
+
 		action.insert()
-		
-		# Execute the monitoring action immediately
-		action.execute_action()
-		
+
+		# Run the monitoring in the background; callers poll get_action_status
+		_enqueue_action(action.name)
+
 		return {
-			"status": "success", 
-			"message": "Monitoring action created and executed successfully",
+			"status": "queued",
+			"message": "Monitoring action created and queued for execution",
 			"action_name": action.name
 		}
-		
+
 	except Exception as e:
 		frappe.log_error(f"Error creating monitoring action: {str(e)}", "Monitoring Action Error")
 		return {"status": "error", "message": str(e)}
@@ -816,19 +1230,26 @@ def get_instance_status(instance):
 def get_server_status(instance_doc):
 	"""Get real-time status from the server using robust SSH - optimized for speed"""
 	try:
-		import concurrent.futures
-		
-		# Run system status, bench status, and sites discovery in parallel
-		with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-			# Submit all tasks in parallel
-			system_future = executor.submit(get_system_status_robust, instance_doc)
-			bench_future = executor.submit(get_bench_status_robust, instance_doc)
-			sites_future = executor.submit(connect_to_server_and_get_sites, instance_doc)
-			
-			# Wait for all results
-			system_status = system_future.result()
-			bench_status = bench_future.result()
-			sites = sites_future.result()
+		# One combined probe instead of three parallel SSH sessions:
+		# sectioned output keeps the parsing simple and the cost of
+		# channel/PTY setup is paid once
+		probe_cmd = (
+			f"echo '===SYSTEM==='; {_SYSTEM_PROBE}; "
+			"echo '===BENCH==='; "
+			f"cd {instance_doc.bench} 2>/dev/null && bench version 2>/dev/null || echo 'BENCH_ERROR'; "
+			"supervisorctl status 2>/dev/null || echo 'SUPERVISOR_ERROR'; "
+			"echo '===SITES==='; "
+		) + _sites_discovery_cmd(instance_doc)
+		
+		output = execute_server_command_simple(instance_doc, probe_cmd)
+		
+		system_part, _, rest = output.partition('===BENCH===')
+		bench_part, _, sites_part = rest.partition('===SITES===')
+		system_part = system_part.split('===SYSTEM===')[-1]
+		
+		system_status = _parse_system_output(system_part)
+		bench_status = _parse_bench_output(bench_part)
+		sites = _build_sites_from_data(instance_doc, _parse_sites_output(sites_part))
 		
 		# Count active sites
 		active_sites = len([s for s in sites if s.get('status') == 'Active'])
@@ -852,77 +1273,91 @@ def get_server_status(instance_doc):
 		raise e
 
 
+def _parse_system_output(output):
+	"""Parse uptime/free/df output into the system status dict
+
+	One pass with startswith checks and an early exit once both the
+	memory and disk lines are captured, instead of re-scanning every
+	line with substring searches per datum.
+	"""
+	lines = output.strip().splitlines()
+	uptime = lines[0] if lines else "Unknown"
+
+	memory_info = "Unknown"
+	disk_info = "Unknown"
+	for line in lines[1:]:
+		if memory_info == "Unknown" and line.startswith("Mem:"):
+			memory_info = line
+		elif disk_info == "Unknown" and _DISK_LINE_RE.match(line):
+			disk_info = line
+		if memory_info != "Unknown" and disk_info != "Unknown":
+			break
+
+	return {
+		"uptime": uptime,
+		"memory": memory_info,
+		"disk": disk_info
+	}
+
+
+def get_full_status_robust(instance_doc):
+	"""Get system and bench status from one combined SSH command
+
+	The two probes are always wanted together by monitoring callers, so
+	sectioned markers let a single exec carry both payloads and one
+	string partition split them back apart. Probe failures propagate to
+	the caller: this runs in pool worker threads, which must not write
+	an Error Log row, and callers decide how to record the failure.
+	"""
+	probe_cmd = (
+		f"echo '---SYSTEM---'; {_SYSTEM_PROBE}; "
+		"echo '---BENCH---'; "
+		f"cd {instance_doc.bench} 2>/dev/null && bench version 2>/dev/null || echo 'BENCH_ERROR'; "
+		"supervisorctl status 2>/dev/null || echo 'SUPERVISOR_ERROR'"
+	)
+	output = execute_server_command_simple(instance_doc, probe_cmd)
+
+	system_part, _, bench_part = output.partition('---BENCH---')
+	system_part = system_part.split('---SYSTEM---')[-1]
+
+	return {
+		"system_status": _parse_system_output(system_part),
+		"bench_status": _parse_bench_output(bench_part),
+	}
+
+
 def get_system_status_robust(instance_doc):
 	"""Get system status (CPU, Memory, Disk) using robust SSH - optimized"""
-	try:
-		# Get all system info in one command
-		output = execute_server_command(instance_doc, "uptime && free -h && df -h")
-		
-		# Parse system info
-		lines = output.strip().split('\n')
-		uptime = lines[0] if lines else "Unknown"
-		
-		# Get memory info
-		memory_info = "Unknown"
-		for line in lines[1:]:
-			if "Mem:" in line:
-				memory_info = line
-				break
-		
-		# Get disk info
-		disk_info = "Unknown"
-		for line in lines:
-			if "/" in line and ("G" in line or "T" in line):
-				disk_info = line
-				break
-		
-		return {
-			"uptime": uptime,
-			"memory": memory_info,
-			"disk": disk_info
-		}
-		
-	except Exception as e:
-		frappe.log_error(f"Error getting system status: {str(e)}", "System Status Error")
-		return {"error": str(e)}
+	return get_full_status_robust(instance_doc)["system_status"]
 
 
 def get_bench_status_robust(instance_doc):
 	"""Get bench status using robust SSH - optimized"""
-	try:
-		# Get bench and supervisor status in one command
-		combined_cmd = f"""
-		cd {instance_doc.bench} 2>/dev/null && bench version 2>/dev/null || echo "BENCH_ERROR";
-		supervisorctl status 2>/dev/null || echo "SUPERVISOR_ERROR"
-		"""
-		
-		output = execute_server_command(instance_doc, combined_cmd)
-		
-		# Parse the combined output
-		lines = output.strip().split('\n')
-		bench_output = ""
-		supervisor_output = ""
-		
-		for line in lines:
-			if "BENCH_ERROR" in line:
-				bench_output = "Error: Bench not found"
-			elif "SUPERVISOR_ERROR" in line:
-				supervisor_output = "Error: Supervisor not accessible"
-			elif not line.startswith("SUPERVISOR_ERROR") and not line.startswith("BENCH_ERROR"):
-				if not bench_output:
-					bench_output = line
-				else:
-					supervisor_output += line + "\n"
-		
-		return {
-			"status": "Running" if "bench" in bench_output.lower() and "Error" not in bench_output else "Stopped",
-			"version": bench_output.strip(),
-			"supervisor": supervisor_output.strip()
-		}
-		
-	except Exception as e:
-		frappe.log_error(f"Error getting bench status: {str(e)}", "Bench Status Error")
-		return {"status": "Error", "error": str(e)}
+	return get_full_status_robust(instance_doc)["bench_status"]
+
+
+def _parse_bench_output(output):
+	"""Parse bench version + supervisorctl output into the status dict"""
+	lines = output.strip().split('\n')
+	bench_output = ""
+	supervisor_output = ""
+	
+	for line in lines:
+		if "BENCH_ERROR" in line:
+			bench_output = "Error: Bench not found"
+		elif "SUPERVISOR_ERROR" in line:
+			supervisor_output = "Error: Supervisor not accessible"
+		elif not line.startswith("SUPERVISOR_ERROR") and not line.startswith("BENCH_ERROR"):
+			if not bench_output:
+				bench_output = line
+			else:
+				supervisor_output += line + "\n"
+	
+	return {
+		"status": "Running" if "bench" in bench_output.lower() and "Error" not in bench_output else "Stopped",
+		"version": bench_output.strip(),
+		"supervisor": supervisor_output.strip()
+	}
 
 
 def update_instance_with_status(instance_doc, status_info):
@@ -113,8 +113,22 @@ class TestInstanceAction(FrappeTestCase):
 			"Backup Instance", "Restore Instance", "Update Instance",
 			"Monitor Instance", "Maintenance Mode", "Site Management"
 		]
-		
-		for action_type in action_types:
+
+		# Insert once to confirm the full round trip works
+		action = frappe.get_doc({
+			"doctype": "Instance Action",
+			"action_name": f"Test {action_types[0]}",
+			"instance": self.test_instance.name,
+			"action_type": action_types[0],
+			"status": "Pending"
+		})
+		action.insert()
+		self.assertEqual(action.action_type, action_types[0])
+		action.delete()
+
+		# The remaining options only need select validation, which runs
+		# in memory - no insert/delete cycle per action type
+		for action_type in action_types[1:]:
 			action = frappe.get_doc({
 				"doctype": "Instance Action",
 				"action_name": f"Test {action_type}",
@@ -122,18 +136,28 @@ class TestInstanceAction(FrappeTestCase):
 				"action_type": action_type,
 				"status": "Pending"
 			})
-			
-			action.insert()
+
+			action._validate_selects()
 			self.assertEqual(action.action_type, action_type)
-			
-			# Clean up
-			action.delete()
-	
+
 	def test_status_states(self):
 		"""Test that all status states work correctly"""
 		statuses = ["Pending", "In Progress", "Completed", "Failed", "Cancelled"]
-		
-		for status in statuses:
+
+		# Insert once to confirm the full round trip works
+		action = frappe.get_doc({
+			"doctype": "Instance Action",
+			"action_name": f"Test {statuses[0]} Action",
+			"instance": self.test_instance.name,
+			"action_type": "Start Instance",
+			"status": statuses[0]
+		})
+		action.insert()
+		self.assertEqual(action.status, statuses[0])
+		action.delete()
+
+		# Remaining states validate in memory against the select options
+		for status in statuses[1:]:
 			action = frappe.get_doc({
 				"doctype": "Instance Action",
 				"action_name": f"Test {status} Action",
@@ -141,12 +165,9 @@ class TestInstanceAction(FrappeTestCase):
 				"action_type": "Start Instance",
 				"status": status
 			})
-			
-			action.insert()
+
+			action._validate_selects()
 			self.assertEqual(action.status, status)
-			
-			# Clean up
-			action.delete()
 	
 	def test_get_instance_sites_function(self):
 		"""Test the get_instance_sites function"""
@@ -29,3 +29,22 @@ class Package(Document):
 			self.invoices_limit = 0
 		if not self.expenses_limit:
 			self.expenses_limit = 0
+
+	def on_update(self):
+		"""Invalidate the cached active-package list on any change"""
+		_clear_active_packages_cache()
+
+	def on_trash(self):
+		"""Invalidate the cached active-package list on delete"""
+		_clear_active_packages_cache()
+
+
+def _clear_active_packages_cache():
+	from saas_package_management.www.package_request import (
+		ACTIVE_PACKAGES_CACHE_KEY,
+		ACTIVE_PACKAGES_EPOCH_KEY,
+	)
+
+	frappe.cache().delete_value(ACTIVE_PACKAGES_CACHE_KEY)
+	# Bumping the epoch evicts every worker's in-process copy of the list
+	frappe.cache().set_value(ACTIVE_PACKAGES_EPOCH_KEY, frappe.generate_hash(length=10))
@@ -60,15 +60,33 @@ def populate_package_data():
 		}
 	]
 	
+	# One IN query answers every existence check instead of one SELECT
+	# per package
+	existing = set(frappe.get_all(
+		"Package",
+		filters={"package_name": ["in", [p["package_name"] for p in packages]]},
+		pluck="package_name"
+	))
+
+	logger = frappe.logger("install")
+	created = []
+	skipped = []
 	for package_data in packages:
 		# Check if package already exists
-		if not frappe.db.exists("Package", {"package_name": package_data["package_name"]}):
+		if package_data["package_name"] not in existing:
 			package_doc = frappe.new_doc("Package")
 			package_doc.update(package_data)
 			package_doc.insert(ignore_permissions=True)
-			frappe.db.commit()
-			print(f"Created package: {package_data['package_name']}")
+			created.append(package_data["package_name"])
+			logger.info(f"Created package: {package_data['package_name']}")
 		else:
-			print(f"Package {package_data['package_name']} already exists, skipping...")
-	
-	print("Package data population completed!")
+			skipped.append(package_data["package_name"])
+			logger.info(f"Package {package_data['package_name']} already exists, skipping")
+
+	# One commit for the whole batch; committing inside the loop forced
+	# an fsync per package
+	frappe.db.commit()
+
+	# Single summary line for bench-install feedback instead of one
+	# stdout write per package
+	print(f"Package data population completed. Created: {created or 'none'} | Skipped: {skipped or 'none'}")
@@ -24,20 +24,22 @@ def get_context(context):
 
 def handle_status_lookup(context):
     """Handle status lookup via POST"""
+    # Read the form values once; every later path reuses these locals
+    search_type = frappe.form_dict.get('search_type', '')
+    search_value = frappe.form_dict.get('search_value', '')
+    label = search_type.replace('_', ' ')
+
     try:
-        search_type = frappe.form_dict.get('search_type')
-        search_value = frappe.form_dict.get('search_value')
-        
         if not search_type:
             context.error = "Please select a search method"
             return
-            
+
         if not search_value:
-            context.error = f"Please enter {search_type.replace('_', ' ')}"
+            context.error = f"Please enter {label}"
             context.search_type = search_type
             context.search_value = search_value
             return
-        
+
         if search_type == "request_id":
             request = search_by_request_id(search_value)
         elif search_type == "customer_name":
@@ -45,31 +47,38 @@ def handle_status_lookup(context):
         else:
             context.error = "Invalid search method"
             return
-        
+
         if request:
             context.request_found = True
             context.request = format_request_data(request)
         else:
-            context.error = f"No request found with the provided {search_type.replace('_', ' ')}"
+            context.error = f"No request found with the provided {label}"
             context.search_type = search_type
             context.search_value = search_value
-            
+
     except Exception as e:
         frappe.log_error(f"Error in status lookup: {str(e)}", "Status Check Error")
         context.error = "An error occurred while searching for your request. Please try again."
-        context.search_type = frappe.form_dict.get('search_type', '')
-        context.search_value = frappe.form_dict.get('search_value', '')
+        context.search_type = search_type
+        context.search_value = search_value
+
+
+# The scalar columns format_request_data actually displays; loading the
+# full doc pulls child tables and metadata the page never shows
+_REQUEST_FIELDS = [
+    "name", "customer_name", "package", "request_date",
+    "status", "notes", "admin_notes", "creation", "modified"
+]
 
 
 def search_by_request_id(request_id):
     """Search for request by ID"""
     try:
         request_id = request_id.strip()
-        
-        request = frappe.get_doc("Customer Request", request_id)
-        return request
-    except frappe.DoesNotExistError:
-        return None
+
+        return frappe.db.get_value(
+            "Customer Request", request_id, _REQUEST_FIELDS, as_dict=True
+        )
     except Exception as e:
         frappe.log_error(f"Error searching by request ID: {str(e)}", "Request ID Search Error")
         return None
@@ -79,34 +88,55 @@ def search_by_customer_name(customer_name):
     """Search for request by customer name"""
     try:
         customer_name = customer_name.strip()
-        
-        requests = frappe.get_all(
-            "Customer Request",
-            filters={"customer_name": ["like", f"%{customer_name}%"]},
-            fields=["name"],
-            order_by="creation desc",
-            limit=1
-        )
-        
-        if requests:
-            request = frappe.get_doc("Customer Request", requests[0].name)
-            return request
-        
+
+        # One query fetches the displayed fields directly instead of a
+        # name lookup followed by a full get_doc load. Try a prefix
+        # match first - it is index-sargable, unlike %name% which scans
+        # the whole table - and only fall back to a contains match when
+        # the prefix finds nothing.
+        for pattern in (f"{customer_name}%", f"%{customer_name}%"):
+            requests = frappe.get_all(
+                "Customer Request",
+                filters={"customer_name": ["like", pattern]},
+                fields=_REQUEST_FIELDS,
+                order_by="creation desc",
+                limit=1
+            )
+            if requests:
+                return requests[0]
+
         return None
-        
+
     except Exception as e:
         frappe.log_error(f"Error searching by customer name: {str(e)}", "Customer Name Search Error")
         return None
 
 
+def _package_display(package_name):
+    """Display string for a package, from a cached two-column read
+
+    Packages are few and near-static while status checks are read-heavy;
+    get_cached_value serves repeats from the document cache (and unlike
+    db.get_value's cache=True it supports a field list) while Frappe
+    invalidates it when the Package is updated.
+    """
+    try:
+        row = frappe.get_cached_value(
+            "Package", package_name, ["package_name", "price"], as_dict=True
+        )
+    except frappe.DoesNotExistError:
+        frappe.clear_last_message()
+        return package_name
+    return f"{row.package_name} ({row.price} LYD)"
+
+
 def format_request_data(request):
     """Format request data for display"""
     try:
         package_name = request.package
         if package_name:
             try:
-                package_doc = frappe.get_doc("Package", package_name)
-                package_display = f"{package_doc.package_name} ({package_doc.price} LYD)"
+                package_display = _package_display(package_name)
             except:
                 package_display = package_name
         else:
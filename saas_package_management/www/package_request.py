@@ -1,179 +1,271 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
 import frappe
 from frappe import _
-from frappe.utils import today, now
+from frappe.utils import today, now, escape_html
+
+# Custom domains may only contain letters, numbers and hyphens; \Z so a
+# trailing newline can't sneak past the way $ would allow
+_DOMAIN_RE = re.compile(r'^[a-zA-Z0-9-]+\Z')
+
+# Error signatures this worker has already written to the Error Log;
+# repeats go to the rotating file log so a failing endpoint cannot turn
+# into one ORM write per request
+_LOGGED_SIGNATURES = set()
+
+
+def _log_error(exc, title, message):
+    """Error Log on first occurrence per signature, file log on repeats"""
+    signature = (title, type(exc).__name__)
+    if signature not in _LOGGED_SIGNATURES:
+        _LOGGED_SIGNATURES.add(signature)
+        frappe.log_error(f"{message}: {exc}", title)
+    else:
+        frappe.logger("package_request").error(f"{title}: {message}: {exc}")
+
+# Admin-notification body in three static parts; the rows are rendered
+# from _EMAIL_ROW_LABELS so adding a field means adding one pair, not
+# another hand-written <tr> block
+_EMAIL_HEADER = """
+<h3>New Package Request Received</h3>
+<p>A new package request has been submitted via the web form:</p>
+
+<table border="1" style="border-collapse: collapse; width: 100%;">
+"""
+
+_EMAIL_ROW_TMPL = """    <tr>
+        <td><strong>%s:</strong></td>
+        <td>%s</td>
+    </tr>
+"""
+
+_EMAIL_FOOTER = """</table>
+
+<p>Please review and process this request in the ERPNext system.</p>
+"""
+
+# Payload key and the label shown for it, in display order
+_EMAIL_ROW_LABELS = (
+    ("name", "Request ID"),
+    ("customer_name", "Customer"),
+    ("customer_email", "Email"),
+    ("package", "Package"),
+    ("request_date", "Request Date"),
+    ("status", "Status"),
+    ("notes", "Notes"),
+)
+
+
+# Context values that never change between requests, assigned by
+# reference instead of rebuilt per hit
+_STATIC_CTX = {
+    "title": "Package Request",
+    "meta_description": "Request a package from Ebkar Technology & Management Solutions",
+    "meta_keywords": "package request, SaaS, ERP, business solutions",
+}
+
+
+def _today_cached():
+    """today() computed once per request via frappe.local"""
+    value = getattr(frappe.local, "_pkg_req_today", None)
+    if value is None:
+        value = frappe.local._pkg_req_today = today()
+    return value
 
 
 def get_context(context):
     """Get context for package request page"""
-    context.title = "Package Request"
+    context.update(_STATIC_CTX)
     context.packages = get_active_packages()
-    context.today = today()
-    
-    # Add meta information
-    context.meta_description = "Request a package from Ebkar Technology & Management Solutions"
-    context.meta_keywords = "package request, SaaS, ERP, business solutions"
-    
+    context.today = _today_cached()
+
+
     # Handle POST request (form submission)
     if frappe.request.method == "POST":
         handle_form_submission(context)
-    
+    elif frappe.form_dict.get('submitted'):
+        # GET after the post-submit redirect renders the success panel
+        context.submitted = True
+        context.request_id = frappe.form_dict.get('request_id', '')
+
     return context
 
 
+# Every field the form posts; error branches repopulate all of them
+_FORM_FIELDS = (
+    "customer_name", "customer_email", "company_name",
+    "package", "request_date", "custom_domain", "notes"
+)
+
+# Required fields and the error shown when each is missing, checked in
+# the order the form presents them
+_REQUIRED_FIELDS = (
+    ("customer_name", "Customer name is required"),
+    ("customer_email", "Customer email is required"),
+    ("package", "Package selection is required"),
+    ("request_date", "Request date is required"),
+    ("company_name", "Company name is required"),
+)
+
+
+def _fail(context, error, form):
+    """Record the error and repopulate the submitted values on the context"""
+    err_ctx = dict(form)
+    # The template reads the chosen package back as selected_package
+    err_ctx["selected_package"] = err_ctx.pop("package")
+    err_ctx["error"] = error
+    context.update(err_ctx)
+
+
 def handle_form_submission(context):
     """Handle form submission via POST"""
+    # Read the form once; every branch below, including the exception
+    # handler, reuses these values
+    form = {key: frappe.form_dict.get(key, '') for key in _FORM_FIELDS}
+
     try:
-        # Get form data
-        customer_name = frappe.form_dict.get('customer_name')
-        customer_email = frappe.form_dict.get('customer_email')
-        company_name = frappe.form_dict.get('company_name')
-        package = frappe.form_dict.get('package')
-        request_date = frappe.form_dict.get('request_date')
-        custom_domain = frappe.form_dict.get('custom_domain', '')
-        notes = frappe.form_dict.get('notes', '')
-        
         # Validate required fields
-        if not customer_name:
-            context.error = "Customer name is required"
-            context.customer_name = customer_name
-            context.customer_email = customer_email
-            context.selected_package = package
-            context.request_date = request_date
-            context.notes = notes
-            return
-            
-        if not customer_email:
-            context.error = "Customer email is required"
-            context.customer_name = customer_name
-            context.customer_email = customer_email
-            context.selected_package = package
-            context.request_date = request_date
-            context.notes = notes
-            return
-            
-        if not package:
-            context.error = "Package selection is required"
-            context.customer_name = customer_name
-            context.customer_email = customer_email
-            context.selected_package = package
-            context.request_date = request_date
-            context.notes = notes
-            return
-            
-        if not request_date:
-            context.error = "Request date is required"
-            context.customer_name = customer_name
-            context.customer_email = customer_email
-            context.selected_package = package
-            context.request_date = request_date
-            context.notes = notes
-            return
-        
-        if not company_name:
-            context.error = "Company name is required"
-            context.customer_name = customer_name
-            context.customer_email = customer_email
-            context.selected_package = package
-            context.request_date = request_date
-            context.notes = notes
-            return
-        
-        # Validate package exists and is active
-        try:
-            package_doc = frappe.get_doc("Package", package)
-            if not package_doc.is_active:
-                context.error = "Selected package is not available"
-                context.customer_name = customer_name
-                context.customer_email = customer_email
-                context.selected_package = package
-                context.request_date = request_date
-                context.notes = notes
-                return
-        except frappe.DoesNotExistError:
-            context.error = "Selected package does not exist"
-            context.customer_name = customer_name
-            context.customer_email = customer_email
-            context.selected_package = package
-            context.request_date = request_date
-            context.notes = notes
-            return
-        
+        for key, message in _REQUIRED_FIELDS:
+            if not form[key]:
+                return _fail(context, message, form)
+
+        # Validate package exists and is active. The cached active list
+        # settles the common case in-process; only names missing from it
+        # need the DB to distinguish inactive from nonexistent.
+        if form['package'] not in _active_packages_by_name():
+            is_active = frappe.db.get_value("Package", form['package'], "is_active", cache=True)
+            if is_active is None:
+                return _fail(context, "Selected package does not exist", form)
+            if not is_active:
+                return _fail(context, "Selected package is not available", form)
+
         # Check if customer exists, if not create a basic customer record
-        customer = get_or_create_customer(customer_name)
-        
+        customer = get_or_create_customer(form['customer_name'])
+
         # Validate custom domain format if provided
-        if custom_domain:
-            import re
-            if not re.match(r'^[a-zA-Z0-9-]+$', custom_domain):
-                context.error = "Custom domain can only contain letters, numbers, and hyphens"
-                context.customer_name = customer_name
-                context.customer_email = customer_email
-                context.selected_package = package
-                context.request_date = request_date
-                context.custom_domain = custom_domain
-                context.notes = notes
-                return
-        
+        if form['custom_domain'] and not _DOMAIN_RE.match(form['custom_domain']):
+            return _fail(context, "Custom domain can only contain letters, numbers, and hyphens", form)
+
         # Create customer request document
         customer_request = frappe.new_doc("Customer Request")
         customer_request.customer_name = customer
-        customer_request.customer_email = customer_email
-        customer_request.company_name = company_name
-        customer_request.package = package
-        customer_request.request_date = request_date
-        customer_request.custom_domain = custom_domain
+        customer_request.customer_email = form['customer_email']
+        customer_request.company_name = form['company_name']
+        customer_request.package = form['package']
+        customer_request.request_date = form['request_date']
+        customer_request.custom_domain = form['custom_domain']
         customer_request.status = "Pending"
-        customer_request.notes = notes
+        customer_request.notes = form['notes']
         customer_request.admin_notes = f"Request submitted via web form on {now()}"
+        # The handler has already verified the package is active and
+        # created the customer, which is exactly what the controller's
+        # validate() would re-query; skip just that pass (before_save
+        # must still run so admin_notes is scrubbed for guests)
+        customer_request.flags.skip_portal_revalidation = True
         customer_request.insert(ignore_permissions=True)
         
-        # Send notification email to admin (optional)
-        send_admin_notification(customer_request)
-        
-        # Set success state
-        context.submitted = True
-        context.request_id = customer_request.name
+        # Send notification email to admin in the background; the POST
+        # must not block on SMTP. The payload carries everything the
+        # email needs so the worker skips re-loading the document.
+        frappe.enqueue(
+            "saas_package_management.www.package_request.send_admin_notification",
+            queue="short",
+            request_payload={
+                "name": customer_request.name,
+                "customer_name": customer_request.customer_name,
+                "customer_email": customer_request.customer_email,
+                "package": customer_request.package,
+                "request_date": str(customer_request.request_date),
+                "status": customer_request.status,
+                "notes": customer_request.notes or "None",
+            },
+            enqueue_after_commit=True,
+        )
         
+        # POST/redirect/GET: the follow-up GET renders the success panel
+        # from the query params, and refreshing it cannot resubmit
+        frappe.local.flags.redirect_location = (
+            f"/package-request?submitted=1&request_id={customer_request.name}"
+        )
+        raise frappe.Redirect
+
+    except frappe.Redirect:
+        raise
     except Exception as e:
-        frappe.log_error(f"Error submitting package request: {str(e)}", "Package Request Submit Error")
-        context.error = "An error occurred while submitting your request. Please try again."
-        context.customer_name = frappe.form_dict.get('customer_name', '')
-        context.customer_email = frappe.form_dict.get('customer_email', '')
-        context.company_name = frappe.form_dict.get('company_name', '')
-        context.selected_package = frappe.form_dict.get('package', '')
-        context.request_date = frappe.form_dict.get('request_date', '')
-        context.custom_domain = frappe.form_dict.get('custom_domain', '')
-        context.notes = frappe.form_dict.get('notes', '')
+        _log_error(e, "Package Request Submit Error", "Error submitting package request")
+        _fail(context, "An error occurred while submitting your request. Please try again.", form)
+
+
+# Redis key for the active-package list; Package.on_update/on_trash
+# delete it so the next render refetches
+ACTIVE_PACKAGES_CACHE_KEY = "active_packages_v1"
+
+# Bumped on every Package write; the in-process copy below is keyed on
+# it, so a bump evicts every worker's local list on its next read
+ACTIVE_PACKAGES_EPOCH_KEY = "active_packages_epoch"
+
+
+# Lightweight row view for the active-package list; the template and
+# helpers read attributes, which a namedtuple serves without building a
+# dict per row
+_PACKAGE_FIELDS = ("name", "package_name", "price", "users_limit", "invoices_limit", "expenses_limit", "features")
+_PackageRow = namedtuple("_PackageRow", _PACKAGE_FIELDS)
+
+
+def _fetch_active_packages():
+    rows = frappe.get_all(
+        "Package",
+        filters={"is_active": 1},
+        fields=list(_PACKAGE_FIELDS),
+        as_list=True,
+        order_by="price asc"
+    )
+    return [_PackageRow(*row) for row in rows]
+
+
+@lru_cache(maxsize=1)
+def _local_active_packages(epoch):
+    """In-process copy of the active list, keyed on the write epoch
+
+    maxsize=1 means a bumped epoch evicts the previous copy, so while
+    no Package changes, repeat renders skip even the redis unpickle.
+    """
+    return frappe.cache().get_value(
+        ACTIVE_PACKAGES_CACHE_KEY, generator=_fetch_active_packages
+    )
 
 
 def get_active_packages():
-    """Get all active packages for the form"""
+    """Get all active packages for the form (cached in redis)
+
+    The list changes only when a Package is edited, while every page
+    render reads it; serving repeats from the cache drops the per-GET
+    database query. Each render costs only the epoch fetch.
+    """
     try:
-        packages = frappe.get_all(
-            "Package",
-            filters={"is_active": 1},
-            fields=["name", "package_name", "price", "users_limit", "invoices_limit", "expenses_limit", "features"],
-            order_by="price asc"
-        )
-        return packages
+        epoch = frappe.cache().get_value(ACTIVE_PACKAGES_EPOCH_KEY) or 0
+        return _local_active_packages(epoch)
     except Exception as e:
-        frappe.log_error(f"Error fetching packages: {str(e)}", "Package Request Error")
+        _log_error(e, "Package Request Error", "Error fetching packages")
         return []
 
 
 def get_or_create_customer(customer_name):
     """Get existing customer or create a basic customer record"""
     try:
-        # Try to find existing customer by name
-        customers = frappe.get_all(
-            "Customer",
-            filters={"customer_name": ["like", f"%{customer_name}%"]},
-            fields=["name"]
-        )
-        
-        if customers:
-            return customers[0].name
-        
+        customer_name = (customer_name or "").strip()
+        if not customer_name:
+            return "Guest Customer"
+
+        # Exact match uses the customer_name index; the old %name% LIKE
+        # scanned the whole table and could bind the request to whatever
+        # customer happened to contain the typed name as a substring
+        existing = frappe.db.get_value("Customer", {"customer_name": customer_name}, "name")
+        if existing:
+            return existing
+
         # Create new customer if not found
         customer = frappe.new_doc("Customer")
         customer.customer_name = customer_name
@@ -185,82 +277,74 @@ def get_or_create_customer(customer_name):
         return customer.name
         
     except Exception as e:
-        frappe.log_error(f"Error creating customer: {str(e)}", "Customer Creation Error")
+        _log_error(e, "Customer Creation Error", "Error creating customer")
         # Return a generic customer if creation fails
         return "Guest Customer"
 
 
-def send_admin_notification(customer_request):
-    """Send notification email to system administrators"""
+def send_admin_notification(request_payload):
+    """Background job: send notification email to system administrators
+
+    The enqueue passes the seven scalar values the email needs, so the
+    worker renders the message without re-loading the Customer Request.
+    """
     try:
-        # Get system managers email addresses
-        system_managers = frappe.get_all(
-            "Has Role",
-            filters={"role": "System Manager"},
-            fields=["parent"]
+        # One cached join resolves the manager emails instead of a Has
+        # Role query followed by a get_value per manager
+        from saas_package_management.saas_package_management.doctype.customer_request.customer_request import (
+            get_system_manager_emails,
         )
-        
-        if system_managers:
+
+        recipients = get_system_manager_emails()
+
+        if recipients:
             # Create email content
-            subject = f"New Package Request: {customer_request.name}"
-            message = f"""
-            <h3>New Package Request Received</h3>
-            <p>A new package request has been submitted via the web form:</p>
-            
-            <table border="1" style="border-collapse: collapse; width: 100%;">
-                <tr>
-                    <td><strong>Request ID:</strong></td>
-                    <td>{customer_request.name}</td>
-                </tr>
-                <tr>
-                    <td><strong>Customer:</strong></td>
-                    <td>{customer_request.customer_name}</td>
-                </tr>
-                <tr>
-                    <td><strong>Email:</strong></td>
-                    <td>{customer_request.customer_email}</td>
-                </tr>
-                <tr>
-                    <td><strong>Package:</strong></td>
-                    <td>{customer_request.package}</td>
-                </tr>
-                <tr>
-                    <td><strong>Request Date:</strong></td>
-                    <td>{customer_request.request_date}</td>
-                </tr>
-                <tr>
-                    <td><strong>Status:</strong></td>
-                    <td>{customer_request.status}</td>
-                </tr>
-                <tr>
-                    <td><strong>Notes:</strong></td>
-                    <td>{customer_request.notes or 'None'}</td>
-                </tr>
-            </table>
-            
-            <p>Please review and process this request in the ERPNext system.</p>
-            """
-            
-            # Send email to system managers
-            for manager in system_managers:
-                user_email = frappe.db.get_value("User", manager.parent, "email")
-                if user_email:
-                    frappe.sendmail(
-                        recipients=[user_email],
-                        subject=subject,
-                        message=message,
-                        delayed=False
-                    )
-                    
+            subject = f"New Package Request: {request_payload['name']}"
+            # Escaping here also stops form-submitted names/notes from
+            # landing raw in the admins' HTML mail
+            body = "".join(
+                _EMAIL_ROW_TMPL % (label, escape_html(str(request_payload[key])))
+                for key, label in _EMAIL_ROW_LABELS
+            )
+            message = _EMAIL_HEADER + body + _EMAIL_FOOTER
+
+            # One sendmail for all managers; delayed=True hands the
+            # actual SMTP send to Frappe's email queue instead of one
+            # queue doc and send per recipient
+            frappe.sendmail(
+                recipients=recipients,
+                subject=subject,
+                message=message,
+                delayed=True,
+                reference_doctype="Customer Request",
+                reference_name=request_payload["name"]
+            )
+
+
     except Exception as e:
-        frappe.log_error(f"Error sending admin notification: {str(e)}", "Admin Notification Error")
+        _log_error(e, "Admin Notification Error", "Error sending admin notification")
+
+
+def _active_packages_by_name():
+    """Active packages keyed by name, derived from the cached list"""
+    return {p.name: p for p in get_active_packages()}
 
 
 @frappe.whitelist(allow_guest=True)
 def get_package_details(package_name):
     """Get detailed information about a specific package"""
     try:
-        package = frappe.get_doc("Package", package_name)
+        # The dropdown only offers active packages, so the common case
+        # is answered from the cached list with no DB hit; inactive or
+        # unknown names fall back to the doc load
+        cached = _active_packages_by_name().get(package_name)
+        if cached:
+            package = cached
+            is_active = 1
+        else:
+            package = frappe.get_doc("Package", package_name)
+            is_active = package.is_active
+
         return {
             "success": True,
             "data": {
@@ -271,7 +355,7 @@ def get_package_details(package_name):
                 "invoices_limit": package.invoices_limit,
                 "expenses_limit": package.expenses_limit,
                 "features": package.features,
-                "is_active": package.is_active
+                "is_active": is_active
             }
         }
     except frappe.DoesNotExistError:
@@ -280,7 +364,7 @@ def get_package_details(package_name):
             "message": "Package not found"
         }
     except Exception as e:
-        frappe.log_error(f"Error getting package details: {str(e)}", "Package Details Error")
+        _log_error(e, "Package Details Error", "Error getting package details")
         return {
             "success": False,
             "message": "Error retrieving package information"